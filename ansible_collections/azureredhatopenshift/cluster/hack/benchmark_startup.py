@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Measure how long each module of the collection takes to import.
+
+Every module invocation is a fresh interpreter, so this import time is paid by
+every task before the module does any work. Each module is imported --runs times
+in a new interpreter; the median is reported next to the startup of a bare
+interpreter. With --importtime the slowest imports of each module are listed.
+
+Every module subclasses AzureRMModuleBaseExt, which loads azure_rm_common and the
+Azure SDK clients it imports, so expect that to dominate. Compare the output
+before and after a change meant to reduce startup time.
+
+The collection and azure.azcollection have to be importable, e.g. run it with the
+python of the Ansible installation:
+
+    python hack/benchmark_startup.py --runs 5 --importtime
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+COLLECTION = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = os.path.join(COLLECTION, 'plugins', 'modules')
+PACKAGE = 'ansible_collections.azureredhatopenshift.cluster.plugins.modules'
+
+
+def python_path():
+    """Make ansible_collections importable from this checkout and the installed collections."""
+    paths = [os.path.dirname(os.path.dirname(os.path.dirname(COLLECTION)))]
+    paths += [p for p in os.environ.get('ANSIBLE_COLLECTIONS_PATH', '').split(os.pathsep) if p]
+    paths += [p for p in os.environ.get('PYTHONPATH', '').split(os.pathsep) if p]
+    return os.pathsep.join(paths)
+
+
+def run(code, importtime=False):
+    env = dict(os.environ, PYTHONPATH=python_path())
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+    started = time.time()
+    process = subprocess.run(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    elapsed = time.time() - started
+    if process.returncode:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'failed')
+    return elapsed, process.stderr
+
+
+def slowest_imports(report, count):
+    """Parse a -X importtime report into the count imports with the highest cumulative time."""
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='imports of each module to take the median of')
+    parser.add_argument('--importtime', action='store_true', help='list the slowest imports of each module')
+    parser.add_argument('--top', type=int, default=10, help='number of imports listed by --importtime')
+    parser.add_argument('modules', nargs='*', help='modules to measure, all by default')
+    args = parser.parse_args()
+
+    modules = args.modules or sorted(f[:-3] for f in os.listdir(MODULES) if f.endswith('.py') and f != '__init__.py')
+    baseline = statistics.median(run('pass')[0] for i in range(args.runs))
+    print('{0:<60} {1:>8.3f}s'.format('(interpreter)', baseline))
+
+    failed = False
+    for module in modules:
+        code = 'import {0}.{1}'.format(PACKAGE, module)
+        try:
+            elapsed = statistics.median(run(code)[0] for i in range(args.runs))
+        except RuntimeError as exc:
+            print('{0:<60} {1}'.format(module, exc))
+            failed = True
+            continue
+        print('{0:<60} {1:>8.3f}s  (+{2:.3f}s)'.format(module, elapsed, elapsed - baseline))
+        if args.importtime:
+            for cumulative, name in slowest_imports(run(code, importtime=True)[1], args.top):
+                print('    {0:<56} {1:>8.3f}s'.format(name, cumulative / 1e6))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,37 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r'''
+options:
+    cache:
+        description:
+            - Local on-disk cache of resource provider responses, shared between module runs.
+        type: dict
+        default: {}
+        suboptions:
+            enabled:
+                description:
+                    - Whether to use the cache. The default depends on the module.
+                type: bool
+            path:
+                description:
+                    - Directory holding the cache.
+                    - Defaults to the C(ARO_CACHE_DIR) environment variable, or C(~/.cache/azureredhatopenshift).
+                type: path
+            ttl:
+                description:
+                    - Seconds after which a cached entry is discarded. The default depends on the module.
+                type: float
+            max_entries:
+                description:
+                    - Number of entries above which the least recently used ones are evicted.
+                type: int
+                default: 512
+'''
@@ -0,0 +1,46 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    DOCUMENTATION = r'''
+options:
+    polling:
+        description:
+            - How to poll long running operations while waiting for them.
+            - Delays grow exponentially from I(initial_delay) up to I(max_delay).
+              A C(Retry-After) header sent by Azure Resource Manager takes precedence.
+        type: dict
+        default: {}
+        suboptions:
+            initial_delay:
+                description:
+                    - Seconds to wait before the first poll.
+                type: float
+                default: 10
+            backoff_factor:
+                description:
+                    - Multiplier applied to the delay after each poll.
+                type: float
+                default: 1.5
+            max_delay:
+                description:
+                    - Upper bound of the delay between two polls, in seconds.
+                type: float
+                default: 120
+            jitter:
+                description:
+                    - Fraction by which each delay is randomly shortened or lengthened.
+                type: float
+                default: 0.2
+            timeout:
+                description:
+                    - Seconds after which waiting fails.
+                type: float
+                default: 5400
+'''
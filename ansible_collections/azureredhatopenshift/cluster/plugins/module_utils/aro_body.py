@@ -0,0 +1,384 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import random
+
+
+def cluster_arg_spec():
+    """Argument spec of the options describing an OpenShift cluster.
+
+    Shared by the cluster module and, per cluster, by the fleet module.
+    """
+    return dict(
+        cluster_profile=dict(
+            type='dict',
+            default=dict(),
+            options=dict(
+                pull_secret=dict(
+                    type='str',
+                    no_log=True,
+                ),
+                cluster_resource_group_id=dict(
+                    type='str',
+                ),
+                domain=dict(
+                    type='str',
+                ),
+                version=dict(
+                    type='str',
+                ),
+                fips_validated_modules=dict(
+                    type='str',
+                    choices=['Enabled', 'Disabled'],
+                    default='Disabled'
+                ),
+            ),
+        ),
+        identity=dict(
+            type="dict",
+            options=dict(
+                type=dict(
+                    type='str',
+                    choices=[
+                        'None',
+                        'SystemAssigned',
+                        'UserAssigned',
+                        'SystemAssigned,UserAssigned'
+                    ]
+                ),
+                user_assigned_identities=dict(
+                    type='dict'
+                )
+            ),
+        ),
+        service_principal_profile=dict(
+            type='dict',
+            options=dict(
+                client_id=dict(
+                    type='str',
+                ),
+                client_secret=dict(
+                    type='str',
+                    no_log=True,
+                )
+            )
+        ),
+        network_profile=dict(
+            type='dict',
+            options=dict(
+                pod_cidr=dict(
+                    type='str',
+                    default='10.128.0.0/14',
+                ),
+                service_cidr=dict(
+                    type='str',
+                    default='172.30.0.0/16',
+                ),
+                outbound_type=dict(
+                    type='str',
+                    choices=['Loadbalancer', 'UserDefinedRouting']
+                ),
+                preconfigured_nsg=dict(
+                    type='str',
+                    choices=['Disabled', 'Enabled'],
+                    default='Disabled'
+                ),
+                load_balancer_profile=dict(
+                    type='dict',
+                    options=dict(
+                        managed_outbound_ips=dict(
+                            type='dict',
+                            options=dict(
+                                count=dict(
+                                    type='int'
+                                )
+                            )
+                        )
+                    )
+                )
+            ),
+            default=dict(
+                pod_cidr="10.128.0.0/14",
+                service_cidr="172.30.0.0/16"
+            )
+        ),
+        platform_workload_identity_profile=dict(
+            type='dict',
+            options=dict(
+                upgradeable_to=dict(
+                    type='str'
+                ),
+                platform_workload_identities=dict(
+                    type='dict',
+                )
+            )
+        ),
+        master_profile=dict(
+            type='dict',
+            options=dict(
+                vm_size=dict(
+                    type='str'
+                ),
+                subnet_id=dict(
+                    type='str',
+                    required=True
+                ),
+                encryption_at_host=dict(
+                    type='str',
+                    choices=['Disabled', 'Enabled'],
+                    default='Disabled'
+                ),
+                disk_encryption_set_id=dict(
+                    type='str'
+                )
+            )
+        ),
+        worker_profiles=dict(
+            type='list',
+            elements='dict',
+            options=dict(
+                name=dict(
+                    type='str',
+                    required=True,
+                    choices=['worker']
+                ),
+                count=dict(
+                    type='int',
+                    default=3,
+                ),
+                vm_size=dict(
+                    type='str'
+                ),
+                subnet_id=dict(
+                    type='str',
+                    required=True
+                ),
+                disk_size=dict(
+                    type='int',
+                ),
+                encryption_at_host=dict(
+                    type='str',
+                    choices=['Disabled', 'Enabled'],
+                    default='Disabled'
+                ),
+                disk_encryption_set_id=dict(
+                    type='str'
+                )
+            )
+        ),
+        api_server_profile=dict(
+            type='dict',
+            options=dict(
+                visibility=dict(
+                    type='str',
+                    choices=['Public', 'Private'],
+                    default='Public'
+                ),
+                url=dict(
+                    type='str',
+                ),
+                ip=dict(
+                    type='str',
+                )
+            )
+        ),
+        ingress_profiles=dict(
+            type='list',
+            elements='dict',
+            options=dict(
+                name=dict(
+                    type='str',
+                    choices=['default'],
+                    default='default'
+                ),
+                visibility=dict(
+                    type='str',
+                    choices=['Public', 'Private'],
+                    default='Public'
+                ),
+                ip=dict(
+                    type='str',
+                )
+            )
+        )
+    )
+
+
+# Where each option of azure_rm_openshiftmanagedcluster goes in the request body.
+# An option maps to the path of its field in the body and to the table of its
+# suboptions, or None when its value is copied as is. A suboption maps to the
+# camelCase field name, or to a (name, table) pair when it has suboptions itself.
+# The '*' key of a table applies to every key of a free-form dict.
+CLUSTER_BODY_FIELDS = {
+    'cluster_profile': (('properties', 'clusterProfile'), {
+        'pull_secret': 'pullSecret',
+        'cluster_resource_group_id': 'resourceGroupId',
+        'domain': 'domain',
+        'version': 'version',
+        'fips_validated_modules': 'fipsValidatedModules',
+    }),
+    'service_principal_profile': (('properties', 'servicePrincipalProfile'), {
+        'client_id': 'clientId',
+        'client_secret': 'clientSecret',
+    }),
+    'identity': (('identity',), {
+        'type': 'type',
+        'user_assigned_identities': 'userAssignedIdentities',
+    }),
+    'platform_workload_identity_profile': (('properties', 'platformWorkloadIdentityProfile'), {
+        'upgradeable_to': 'upgradeableTo',
+        'platform_workload_identities': ('platformWorkloadIdentities', {
+            '*': {
+                'resource_id': 'resourceId',
+            },
+        }),
+    }),
+    'network_profile': (('properties', 'networkProfile'), {
+        'pod_cidr': 'podCidr',
+        'service_cidr': 'serviceCidr',
+        'outbound_type': 'outboundType',
+        'preconfigured_nsg': 'preconfiguredNSG',
+        'load_balancer_profile': ('loadBalancerProfile', {
+            'managed_outbound_ips': ('managedOutboundIps', {
+                'count': 'count',
+            }),
+        }),
+    }),
+    'master_profile': (('properties', 'masterProfile'), {
+        'subnet_id': 'subnetId',
+        'disk_encryption_set_id': 'diskEncryptionSetId',
+        'encryption_at_host': 'encryptionAtHost',
+        'vm_size': 'vmSize',
+    }),
+    'worker_profiles': (('properties', 'workerProfiles'), {
+        'name': 'name',
+        'subnet_id': 'subnetId',
+        'count': 'count',
+        'vm_size': 'vmSize',
+        'disk_size': 'diskSizeGB',
+        'encryption_at_host': 'encryptionAtHost',
+        'disk_encryption_set_id': 'diskEncryptionSetId',
+    }),
+    'api_server_profile': (('properties', 'apiserverProfile'), {
+        'visibility': 'visibility',
+    }),
+    'ingress_profiles': (('properties', 'ingressProfiles'), {
+        'name': 'name',
+        'visibility': 'visibility',
+    }),
+}
+
+
+def compile_table(table):
+    """Turn a table of CLUSTER_BODY_FIELDS into (option, field, compiled table) tuples."""
+    if table is None:
+        return None
+    compiled = []
+    for option, field in table.items():
+        if isinstance(field, tuple):
+            field, subtable = field
+        elif isinstance(field, dict):
+            subtable = field
+        else:
+            subtable = None
+        compiled.append((option, field, compile_table(subtable)))
+    return tuple(compiled)
+
+
+COMPILED_CLUSTER_BODY_FIELDS = tuple(
+    (option, path, compile_table(table)) for option, (path, table) in CLUSTER_BODY_FIELDS.items()
+)
+
+
+def is_empty(value):
+    return value is None or value == '' or value == {} or value == []
+
+
+def convert(value, compiled):
+    """Convert an option value with a compiled table, dropping unset suboptions."""
+    if compiled is None or is_empty(value):
+        return value
+    if isinstance(value, list):
+        return [item for item in (convert(v, compiled) for v in value) if not is_empty(item)]
+    if compiled and compiled[0][0] == '*':
+        subtable = compiled[0][2]
+        return dict((k, convert(v, subtable)) for k, v in value.items() if not is_empty(v))
+    converted = {}
+    for option, field, subtable in compiled:
+        item = convert(value.get(option), subtable)
+        if not is_empty(item):
+            converted[field] = item
+    return converted
+
+
+def build_body(params, body=None):
+    """Build the body of an OpenShift cluster request from module parameters.
+
+    Only the options of CLUSTER_BODY_FIELDS are handled, the others are left to the
+    caller. Returns the body, which is created or updated in place.
+    """
+    if body is None:
+        body = dict(properties={})
+    for option, path, compiled in COMPILED_CLUSTER_BODY_FIELDS:
+        value = convert(params.get(option), compiled)
+        if is_empty(value):
+            continue
+        target = body
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+    return body
+
+
+def validate_create_body(body):
+    """Raise ValueError when body lacks a profile the resource provider requires to create a cluster."""
+    for profile in ("workerProfiles", "clusterProfile", "masterProfile"):
+        if profile not in body['properties']:
+            raise ValueError('{0} is required for creating a openshift cluster'.format(profile))
+    if "servicePrincipalProfile" not in body['properties'] and \
+       "platformWorkloadIdentityProfile" not in body['properties']:
+        raise ValueError('Either service_principal_profile or platform_workload_identity_profile is required for creating an openshift cluster')
+
+
+# Added per Mangirdas Judeikis (RED HAT INC) to fix first letter of cluster domain beginning with digit ; currently not supported
+def random_id():
+    return (''.join(random.choice('abcdefghijklmnopqrstuvwxyz')) +
+            ''.join(random.choice('abcdefghijklmnopqrstuvwxyz1234567890')
+                    for key in range(7)))
+
+
+def set_create_defaults(body, subscription_id, name):
+    """Fill in the defaults of a cluster creation request body, returning the random id it used."""
+    properties = body['properties']
+    if 'apiserverProfile' not in properties:
+        api_profile = dict(visibility="Public")
+        properties['apiserverProfile'] = api_profile
+    if 'ingressProfiles' not in properties:
+        ingress_profile = dict(visibility="Public", name="default")
+        properties['ingressProfiles'] = [ingress_profile]
+    else:
+        # hard code the ingress profile name as default, so user don't need to specify it
+        for profile in properties['ingressProfiles']:
+            profile['name'] = "default"
+    if 'name' not in properties['workerProfiles'][0]:
+        properties['workerProfiles'][0]['name'] = 'worker'
+    if 'vmSize' not in properties['workerProfiles'][0]:
+        properties['workerProfiles'][0]['vmSize'] = "Standard_D4s_v3"
+    if 'diskSizeGB' not in properties['workerProfiles'][0]:
+        properties['workerProfiles'][0]['diskSizeGB'] = 128
+    if 'vmSize' not in properties['masterProfile']:
+        properties['masterProfile']['vmSize'] = "Standard_D8s_v3"
+    if 'pullSecret' not in properties['clusterProfile']:
+        properties['clusterProfile']['pullSecret'] = ''
+    # if domain is not set in cluster profile or it is set to an empty string or null value then generate a random domain
+    generated_id = random_id()
+    if 'domain' not in properties['clusterProfile'] or not properties['clusterProfile']['domain']:
+        properties['clusterProfile']['domain'] = generated_id
+    if 'resourceGroupId' not in properties['clusterProfile'] or not properties['clusterProfile']['resourceGroupId']:
+        resourcegroup_id = "/subscriptions/" + subscription_id + "/resourceGroups/" + name + "-" + generated_id
+        properties['clusterProfile']['resourceGroupId'] = resourcegroup_id
+    return generated_id
@@ -0,0 +1,237 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Optional long-lived broker holding warm ARM clients for the modules of this collection.
+
+Every module invocation is a fresh Python process, so it normally pays for SDK
+imports, an AAD token and a TLS handshake before its first request. The broker is
+a local daemon listening on a unix socket which keeps one GenericRestClient per
+(subscription, endpoint) alive, with its keep-alive connection pool and token cache.
+
+The broker authenticates with azure.identity's DefaultAzureCredential (environment
+variables, managed identity or the Azure CLI login of the user running it). The
+authentication options of the modules (auth_source, profile, client_id, secret,
+...) are ignored while a broker is used, so start it with the same identity as the
+playbook, then export the socket path to the modules through the environment::
+
+    python -m ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_broker \\
+        --socket /tmp/aro-broker.sock &
+    export ARO_BROKER_SOCKET=/tmp/aro-broker.sock
+
+The protocol is one JSON document per line, one request per connection.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import os
+import socket
+import threading
+import time
+
+
+BROKER_SOCKET_ENV = 'ARO_BROKER_SOCKET'
+DEVELOPMENT_BASE_URL = 'https://localhost:8443/'
+
+
+class BrokerError(Exception):
+    def __init__(self, message, status_code=None):
+        super(BrokerError, self).__init__(message)
+        self.status_code = status_code
+
+
+class BrokerResponse(object):
+    """Minimal stand-in for the azure-core HttpResponse returned by GenericRestClient.query."""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = (body or '').encode('utf-8')
+
+    def body(self):
+        return self._body
+
+    def text(self):
+        return self._body.decode('utf-8')
+
+
+class BrokerClient(object):
+    """Drop-in replacement for GenericRestClient forwarding queries to the broker."""
+
+    def __init__(self, socket_path, subscription_id, resource_manager, base_url=None, verify=True, timeout=900):
+        self.socket_path = socket_path
+        self.subscription_id = subscription_id
+        self.resource_manager = resource_manager
+        self.base_url = base_url or resource_manager
+        self.verify = verify
+        self.timeout = timeout
+
+    def query(self, url, method, query_parameters, header_parameters, body, expected_status_codes,
+              polling_timeout, polling_interval):
+        request = dict(
+            subscription_id=self.subscription_id,
+            resource_manager=self.resource_manager,
+            base_url=self.base_url,
+            verify=self.verify,
+            url=url,
+            method=method,
+            query_parameters=query_parameters,
+            header_parameters=header_parameters,
+            body=body,
+            expected_status_codes=expected_status_codes,
+            polling_timeout=polling_timeout,
+            polling_interval=polling_interval,
+        )
+        reply = self._call(request)
+        if 'error' in reply:
+            raise BrokerError(reply['error'], reply.get('status_code'))
+        return BrokerResponse(reply['status_code'], reply.get('headers'), reply.get('body'))
+
+    def _call(self, request):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            stream = sock.makefile('rb')
+            line = stream.readline()
+            stream.close()
+        finally:
+            sock.close()
+        if not line:
+            raise BrokerError('Broker at {0} closed the connection without replying'.format(self.socket_path))
+        return json.loads(line.decode('utf-8'))
+
+
+def broker_socket(log=None, timeout=1):
+    """Return the broker socket path from the environment if a broker is listening on it.
+
+    A socket file left behind by a broker which died does not count: the modules
+    then build their own client instead of failing every query.
+    """
+    socket_path = os.environ.get(BROKER_SOCKET_ENV)
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path)
+    except (OSError, socket.error) as exc:
+        if log is not None:
+            log('No broker listening on {0}, not using it: {1}'.format(socket_path, exc))
+        return None
+    finally:
+        sock.close()
+    return socket_path
+
+
+class BrokerServer(object):
+    """Unix socket server answering BrokerClient requests with cached GenericRestClients."""
+
+    def __init__(self, socket_path, idle_timeout=None, credential=None):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.credential = credential
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.last_request = time.time()
+        self.server = None
+
+    def get_credential(self):
+        if self.credential is None:
+            from azure.identity import DefaultAzureCredential
+            self.credential = DefaultAzureCredential()
+        return self.credential
+
+    def get_client(self, request):
+        key = (request['subscription_id'], request['resource_manager'], request['base_url'], request['verify'])
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+                scope = request['resource_manager'].rstrip('/') + '/.default'
+                client = GenericRestClient(self.get_credential(),
+                                           request['subscription_id'],
+                                           base_url=request['base_url'],
+                                           credential_scopes=[scope])
+                if not request['verify']:
+                    client._client._pipeline._transport.connection_config.verify = False
+                self.clients[key] = client
+        return client
+
+    def handle(self, request):
+        self.last_request = time.time()
+        try:
+            response = self.get_client(request).query(request['url'],
+                                                       request['method'],
+                                                       request['query_parameters'],
+                                                       request['header_parameters'],
+                                                       request['body'],
+                                                       request['expected_status_codes'],
+                                                       request['polling_timeout'],
+                                                       request['polling_interval'])
+        except Exception as exc:
+            return dict(error=str(exc), status_code=getattr(exc, 'status_code', None))
+        return dict(status_code=response.status_code,
+                    headers=dict(response.headers),
+                    body=response.text())
+
+    def serve_forever(self):
+        try:
+            import socketserver
+        except ImportError:
+            import SocketServer as socketserver
+
+        broker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                reply = broker.handle(json.loads(line.decode('utf-8')))
+                self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            self.server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        if self.idle_timeout:
+            watchdog = threading.Thread(target=self._shutdown_when_idle)
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def _shutdown_when_idle(self):
+        while time.time() - self.last_request < self.idle_timeout:
+            time.sleep(min(self.idle_timeout, 10))
+        self.server.shutdown()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve warm ARM clients to the azureredhatopenshift.cluster modules')
+    parser.add_argument('--socket', default=os.environ.get(BROKER_SOCKET_ENV, '/tmp/aro-broker.sock'),
+                        help='Path of the unix socket to listen on')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Exit after this many seconds without requests')
+    args = parser.parse_args()
+    BrokerServer(args.socket, idle_timeout=args.idle_timeout).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
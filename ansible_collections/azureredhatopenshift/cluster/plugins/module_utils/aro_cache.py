@@ -0,0 +1,195 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import response_headers, response_json
+
+
+CACHE_DIR_ENV = 'ARO_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'azureredhatopenshift')
+DEFAULT_MAX_ENTRIES = 512
+
+# Serializes the threads of a process, the file lock serializes processes
+STATE_LOCK = threading.Lock()
+
+
+def cache_arg_spec():
+    """Argument spec of the I(cache) option, see the aro_cache doc fragment."""
+    return dict(
+        type='dict',
+        default=dict(),
+        options=dict(
+            enabled=dict(type='bool'),
+            path=dict(type='path'),
+            ttl=dict(type='float'),
+            max_entries=dict(type='int', default=DEFAULT_MAX_ENTRIES),
+        )
+    )
+
+
+def cache_from_params(params, kind, enabled=False, ttl=None):
+    """Build the FileCache described by a I(cache) option, or None if it is disabled.
+
+    enabled and ttl are the defaults of the calling module. Each kind of cached
+    data lives in its own subdirectory.
+    """
+    params = params or {}
+    if not (enabled if params.get('enabled') is None else params['enabled']):
+        return None
+    path = params.get('path') or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+    return FileCache(os.path.join(os.path.expanduser(path), kind),
+                     ttl=ttl if params.get('ttl') is None else params['ttl'],
+                     max_entries=params.get('max_entries') or DEFAULT_MAX_ENTRIES)
+
+
+class FileCache(object):
+    """Size bounded, least recently used, on-disk JSON cache shared between module runs.
+
+    Entries are written through a temporary file and os.replace so that concurrent
+    workers never read a partial entry. An entry older than ttl seconds is a miss.
+    The modification time of an entry records its last use, for eviction.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(*parts):
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def filename(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def get(self, key):
+        filename = self.filename(key)
+        try:
+            with open(filename) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if self.ttl is not None and time.time() - entry.get('stored', 0) > self.ttl:
+            self.delete(key)
+            return None
+        try:
+            os.utime(filename, None)
+        except OSError:
+            pass
+        return entry.get('value')
+
+    def put(self, key, value):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path, 0o700)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(stored=time.time(), value=value), f)
+            os.replace(tmp, self.filename(key))
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict()
+
+    def delete(self, key):
+        try:
+            os.unlink(self.filename(key))
+        except OSError:
+            pass
+
+    def evict(self):
+        if not self.max_entries:
+            return
+        entries = []
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.path, name)), name))
+                except OSError:
+                    pass
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for mtime, name in entries[:len(entries) - self.max_entries]:
+            try:
+                os.unlink(os.path.join(self.path, name))
+            except OSError:
+                pass
+
+
+def locked_update(path, change):
+    """Apply change to the JSON document stored in path, under an exclusive file lock.
+
+    change receives the document ({} when missing or unreadable) and modifies it in
+    place; its return value is returned. The document is replaced atomically, so
+    readers never see a partial write.
+    """
+    directory = os.path.dirname(path)
+    with STATE_LOCK:
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        with open(path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(path) as f:
+                        state = json.load(f)
+                except (IOError, OSError, ValueError):
+                    state = {}
+                result = change(state)
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(state, f)
+                os.replace(tmp, path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return result
+
+
+def conditional_get(client, cache, url, query_parameters, header_parameters, status_code):
+    """GET url, revalidating a cached copy of the document with its ETag.
+
+    Returns (status_code, body, response). A 304 Not Modified is reported as a 200
+    carrying the cached body. Without a cache this is a plain GET.
+    """
+    key = entry = None
+    headers = dict(header_parameters)
+    if cache is not None:
+        key = cache.key(url, query_parameters.get('api-version'))
+        entry = cache.get(key)
+        if entry:
+            headers['If-None-Match'] = entry['etag']
+
+    response = client.query(url,
+                            'GET',
+                            query_parameters,
+                            headers,
+                            None,
+                            list(status_code) + [304],
+                            600,
+                            30)
+    if response.status_code == 304 and entry:
+        return 200, entry['body'], response
+    if response.status_code != 200:
+        return response.status_code, None, response
+
+    body = response_json(response)
+    if cache is not None:
+        etag = response_headers(response).get('etag')
+        if etag:
+            cache.put(key, dict(etag=etag, body=body))
+        elif entry:
+            cache.delete(key)
+    return 200, body, response
@@ -0,0 +1,72 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+# Fields of an OpenShift cluster the resource provider accepts in a PATCH.
+# A field listed here is compared and sent as a whole, e.g. all tags at once.
+MUTABLE_FIELDS = (
+    ('tags',),
+    ('properties', 'networkProfile', 'loadBalancerProfile', 'managedOutboundIps', 'count'),
+    ('properties', 'platformWorkloadIdentityProfile', 'upgradeableTo'),
+    ('properties', 'platformWorkloadIdentityProfile', 'platformWorkloadIdentities'),
+)
+
+# Fields replaced as a whole by a PATCH, so keys missing from the desired value are removed
+EXACT_FIELDS = (
+    ('tags',),
+)
+
+# Resource ids may come back from ARM with a different case than they were sent
+CASE_INSENSITIVE_KEYS = ('id', 'resourceId', 'resourceGroupId', 'subnetId', 'diskEncryptionSetId')
+
+
+def equal(desired, current, key=None, exact=False):
+    """Compare a desired value to the live one, ignoring the case of resource ids.
+
+    Unless exact, keys the live document has in addition to the desired ones, such
+    as the read-only clientId of a workload identity, do not count as a difference.
+    """
+    if isinstance(desired, dict) and isinstance(current, dict):
+        if exact and set(desired) != set(current):
+            return False
+        return all(k in current and equal(v, current[k], k, exact) for k, v in desired.items())
+    if isinstance(desired, list) and isinstance(current, list):
+        return len(desired) == len(current) and all(equal(d, c, key, exact) for d, c in zip(desired, current))
+    if key in CASE_INSENSITIVE_KEYS and isinstance(desired, str) and isinstance(current, str):
+        return desired.lower() == current.lower()
+    return desired == current
+
+
+def diff_patch(desired, current, mutable_fields=MUTABLE_FIELDS):
+    """Compute the minimal PATCH document turning current into desired.
+
+    Only fields of desired are considered, so fields the user did not set are left
+    alone. Returns (patch, ignored): patch holds the changed mutable fields and is
+    empty when nothing has to be sent, ignored lists the dotted paths of changed
+    fields the resource provider does not allow to update. Fields the resource
+    provider never returns, like secrets, are not reported as ignored.
+    """
+    ignored = []
+    patch = _diff(desired, current or {}, (), set(mutable_fields), ignored)
+    return patch or {}, ignored
+
+
+def _diff(desired, current, prefix, mutable_fields, ignored):
+    patch = {}
+    for key, value in desired.items():
+        path = prefix + (key,)
+        live = current.get(key) if isinstance(current, dict) else None
+        if path in mutable_fields:
+            if not equal(value, live, key, path in EXACT_FIELDS):
+                patch[key] = value
+        elif isinstance(value, dict) and (live is None or isinstance(live, dict)):
+            child = _diff(value, live or {}, path, mutable_fields, ignored)
+            if child:
+                patch[key] = child
+        elif live is not None and not equal(value, live, key):
+            ignored.append('.'.join(path))
+    return patch
@@ -0,0 +1,44 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import base64
+import calendar
+import re
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
+
+CLIENT_CERTIFICATE_RE = re.compile(r'client-certificate-data:\s*["\']?([A-Za-z0-9+/=]+)')
+
+
+def client_certificate_expiry(kubeconfig):
+    """Return when the earliest client certificate embedded in a kubeconfig expires.
+
+    kubeconfig is the base64 encoded document returned by listAdminCredentials.
+    The result is a UNIX timestamp, or None when there is no certificate or it
+    cannot be parsed (e.g. the cryptography library is missing).
+    """
+    if not HAS_CRYPTOGRAPHY or not kubeconfig:
+        return None
+    try:
+        document = base64.b64decode(kubeconfig).decode('utf-8')
+    except Exception:
+        return None
+    expiries = []
+    for data in CLIENT_CERTIFICATE_RE.findall(document):
+        try:
+            certificate = x509.load_pem_x509_certificate(base64.b64decode(data), default_backend())
+        except Exception:
+            continue
+        not_after = getattr(certificate, 'not_valid_after_utc', None) or certificate.not_valid_after
+        expiries.append(calendar.timegm(not_after.utctimetuple()))
+    return min(expiries) if expiries else None
@@ -0,0 +1,81 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Local ledger of the deletions started without waiting for them.
+
+azure_rm_openshiftmanagedcluster with state=absent and wait=false records the
+operation handle of the deletion here, and azure_rm_openshiftmanagedcluster_reaper
+later polls every pending deletion, retries the failed ones and drops the
+finished ones. Entries are keyed by resource URL, so deleting the same resource
+twice only leaves the latest operation.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import time
+
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import CACHE_DIR_ENV, DEFAULT_CACHE_DIR, locked_update
+
+
+LEDGER_ENV = 'ARO_LEDGER_FILE'
+
+
+def ledger_path(path=None):
+    """Path of the ledger: path, else ARO_LEDGER_FILE, else ledger.json in the cache directory."""
+    if not path:
+        path = os.environ.get(LEDGER_ENV) or os.path.join(os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR, 'ledger.json')
+    return os.path.expanduser(path)
+
+
+def entry_key(operation):
+    return operation['resource_url'].strip('/').lower()
+
+
+class Ledger(object):
+    """Pending deletions in a JSON file shared between processes.
+
+    Each entry holds the operation handle, the subscription it belongs to, when it
+    was first and last recorded, the number of DELETE requests sent so far and the
+    last error.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, operation, subscription_id, attempts=1, error=None, first_recorded=None):
+        recorded = time.time()
+        entry = dict(operation=operation,
+                     subscription_id=subscription_id,
+                     recorded=recorded,
+                     first_recorded=first_recorded or recorded,
+                     attempts=attempts,
+                     error=error)
+
+        def add(state):
+            state[entry_key(operation)] = entry
+            return entry
+
+        return locked_update(self.path, add)
+
+    def entries(self, subscription_id=None):
+        """Pending entries by key, only those of subscription_id if given."""
+        def read(state):
+            return dict((k, v) for k, v in state.items()
+                        if subscription_id is None or v.get('subscription_id', '').lower() == subscription_id.lower())
+
+        if not os.path.exists(self.path):
+            return {}
+        return locked_update(self.path, read)
+
+    def remove(self, key, recorded):
+        """Drop an entry, unless it was recorded again since it was read."""
+        def drop(state):
+            if key in state and state[key].get('recorded') == recorded:
+                del state[key]
+                return True
+            return False
+
+        return locked_update(self.path, drop)
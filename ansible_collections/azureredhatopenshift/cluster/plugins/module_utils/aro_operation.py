@@ -0,0 +1,127 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import base64
+import json
+
+
+ASYNC_OPERATION_HEADER = 'Azure-AsyncOperation'
+LOCATION_HEADER = 'Location'
+
+# Terminal values of the ARM async operation "status" field
+SUCCEEDED = 'Succeeded'
+FAILED = 'Failed'
+CANCELED = 'Canceled'
+TERMINAL_STATUSES = (SUCCEEDED, FAILED, CANCELED)
+
+
+def response_headers(response):
+    """Return the response headers as a case-insensitive lookup dict."""
+    headers = getattr(response, 'headers', None) or {}
+    return dict((k.lower(), v) for k, v in headers.items())
+
+
+def response_json(response):
+    """Decode the JSON body of a GenericRestClient response, or {} if empty."""
+    if hasattr(response, 'body'):
+        body = response.body()
+    elif isinstance(getattr(response, 'text', None), str):
+        body = response.text
+    else:
+        body = response.text()
+    if not body:
+        return {}
+    if isinstance(body, bytes):
+        body = body.decode('utf-8')
+    return json.loads(body)
+
+
+def operation_from_response(response, resource_url, method, api_version, rp_mode):
+    """Build an operation handle from the initial response of a long running operation.
+
+    The handle records where to poll for the operation status and enough about the
+    originating request to fetch the resource once the operation has finished.
+    """
+    headers = response_headers(response)
+    operation = dict(
+        method=method,
+        resource_url=resource_url,
+        api_version=api_version,
+        rp_mode=rp_mode,
+        status_code=response.status_code,
+        async_operation_url=headers.get(ASYNC_OPERATION_HEADER.lower()),
+        location_url=headers.get(LOCATION_HEADER.lower()),
+    )
+    operation['token'] = encode_token(operation)
+    return operation
+
+
+def encode_token(operation):
+    """Serialize an operation handle into an opaque, url-safe token."""
+    payload = dict((k, v) for k, v in operation.items() if k != 'token')
+    data = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_token(token):
+    """Inverse of encode_token. Raises ValueError on malformed tokens."""
+    try:
+        operation = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+    except Exception as exc:
+        raise ValueError('Invalid operation token: {0}'.format(exc))
+    if not isinstance(operation, dict) or 'resource_url' not in operation:
+        raise ValueError('Invalid operation token: missing resource_url')
+    operation['token'] = token
+    return operation
+
+
+def query_status(client, operation, header_parameters):
+    """Query the status monitor of a long running operation.
+
+    The Azure-AsyncOperation document is a few hundred bytes, so polling it is far
+    cheaper than polling the resource. Returns (status, body, response), where body
+    is the status document ({} for a Location monitor), or None when the resource
+    provider sent no monitor and the caller has to poll the resource instead.
+    """
+    if operation.get('async_operation_url'):
+        response = client.query(operation['async_operation_url'],
+                                'GET',
+                                {},
+                                header_parameters,
+                                None,
+                                [200, 202, 429],
+                                0,
+                                30)
+        if response.status_code == 429:
+            return 'InProgress', {}, response
+        body = response_json(response)
+        return body.get('status', 'InProgress'), body, response
+    if operation.get('location_url'):
+        response = client.query(operation['location_url'],
+                                'GET',
+                                {},
+                                header_parameters,
+                                None,
+                                [200, 202, 204, 429],
+                                0,
+                                30)
+        if response.status_code in (202, 429):
+            return 'InProgress', {}, response
+        return SUCCEEDED, {}, response
+    return None
+
+
+def operation_progress(status, body):
+    """Summarize a status document as the progress reported to users."""
+    progress = dict(status=status)
+    for key, name in (('percentComplete', 'percent_complete'),
+                      ('startTime', 'start_time'),
+                      ('endTime', 'end_time'),
+                      ('error', 'error')):
+        if body.get(key) is not None:
+            progress[name] = body[key]
+    return progress
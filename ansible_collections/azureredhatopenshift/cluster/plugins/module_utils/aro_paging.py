@@ -0,0 +1,43 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import response_json
+
+
+def iter_pages(client, url, query_parameters, header_parameters, status_code):
+    """Yield the pages of an ARM list operation, following nextLink.
+
+    Only the current page is held in memory. The nextLink URL is absolute and
+    already carries api-version and the continuation token, so it is queried
+    without additional query parameters.
+    """
+    while url:
+        response = client.query(url,
+                                'GET',
+                                query_parameters,
+                                header_parameters,
+                                None,
+                                status_code,
+                                600,
+                                30)
+        page = response_json(response)
+        yield page
+        url = page.get('nextLink')
+        query_parameters = {}
+
+
+def iter_items(client, url, query_parameters, header_parameters, status_code, max_items=None):
+    """Yield the items of an ARM list operation across pages, stopping after max_items."""
+    if max_items is not None and max_items <= 0:
+        return
+    count = 0
+    for page in iter_pages(client, url, query_parameters, header_parameters, status_code):
+        for item in page.get('value') or []:
+            yield item
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
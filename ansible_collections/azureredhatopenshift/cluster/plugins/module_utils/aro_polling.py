@@ -0,0 +1,195 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import random
+import time
+from email.utils import parsedate_tz, mktime_tz
+
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import conditional_get
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import (
+    FAILED, SUCCEEDED, operation_progress, query_status, response_headers
+)
+
+
+RETRY_AFTER_HEADER = 'Retry-After'
+
+DEFAULT_INITIAL_DELAY = 10
+DEFAULT_BACKOFF_FACTOR = 1.5
+DEFAULT_MAX_DELAY = 120
+DEFAULT_JITTER = 0.2
+DEFAULT_TIMEOUT = 5400
+# Consecutive errors, e.g. a transient 5xx, tolerated while waiting for an operation
+MAX_POLLING_ERRORS = 3
+
+# Replication of a new principal or role assignment usually takes seconds, rarely minutes
+PROPAGATION_DEFAULTS = dict(
+    initial_delay=1,
+    backoff_factor=2,
+    max_delay=15,
+    timeout=600,
+)
+
+
+def polling_arg_spec(**defaults):
+    """Argument spec of the I(polling) option, see the aro_polling doc fragment.
+
+    defaults overrides the default of some suboptions, e.g. PROPAGATION_DEFAULTS.
+    """
+    return dict(
+        type='dict',
+        default=dict(),
+        options=dict(
+            initial_delay=dict(type='float', default=defaults.get('initial_delay', DEFAULT_INITIAL_DELAY)),
+            backoff_factor=dict(type='float', default=defaults.get('backoff_factor', DEFAULT_BACKOFF_FACTOR)),
+            max_delay=dict(type='float', default=defaults.get('max_delay', DEFAULT_MAX_DELAY)),
+            jitter=dict(type='float', default=defaults.get('jitter', DEFAULT_JITTER)),
+            timeout=dict(type='float', default=defaults.get('timeout', DEFAULT_TIMEOUT)),
+        )
+    )
+
+
+def retry_after(response):
+    """Return the delay in seconds requested by a Retry-After header, or None."""
+    if response is None:
+        return None
+    value = response_headers(response).get(RETRY_AFTER_HEADER.lower())
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, mktime_tz(parsed) - time.time())
+
+
+def resource_status(method, status_code, resource):
+    """Status and progress of an operation, derived from the resource it works on.
+
+    A DELETE has succeeded once the resource is gone. A create or update ends with
+    the provisioning state of the resource, and fails if the resource disappeared.
+    """
+    if status_code == 404:
+        if method == 'DELETE':
+            return SUCCEEDED, operation_progress(SUCCEEDED, {})
+        error = dict(code='NotFound', message='The resource does not exist')
+        return FAILED, operation_progress(FAILED, dict(error=error))
+    if resource is None or method == 'DELETE':
+        return 'InProgress', operation_progress('InProgress', {})
+    properties = resource.get('properties', {})
+    status = properties.get('provisioningState', 'InProgress')
+    return status, operation_progress(status, properties)
+
+
+def poll_operation(client, operation, header_parameters, cache=None):
+    """Poll a long running operation once.
+
+    The status monitor of the operation is used when the resource provider sent one,
+    otherwise the resource itself is read, revalidated through cache if given.
+    Returns (status, progress, response, resource), where resource is the document
+    read in the latter case. Errors other than 404 and 429 are raised.
+    """
+    monitored = query_status(client, operation, header_parameters)
+    if monitored is not None:
+        status, body, response = monitored
+        return status, operation_progress(status, body), response, None
+    status_code, resource, response = conditional_get(client,
+                                                      cache,
+                                                      operation['resource_url'],
+                                                      {'api-version': operation['api_version']},
+                                                      header_parameters,
+                                                      [200, 404, 429])
+    status, progress = resource_status(operation['method'], status_code, resource)
+    return status, progress, response, resource
+
+
+class PollingTimeout(Exception):
+    pass
+
+
+class Poller(object):
+    """Exponential backoff poller honoring ARM Retry-After headers.
+
+    Delays start at initial_delay and grow by backoff_factor up to max_delay. Each
+    delay is randomized by +/- jitter (a fraction) so that concurrent pollers spread
+    out, and a Retry-After sent by the server takes precedence over the computed delay.
+    Up to max_errors consecutive exceptions raised by a check, e.g. a transient 5xx
+    or connection error, are retried like an unfinished check.
+    """
+
+    def __init__(self, initial_delay=DEFAULT_INITIAL_DELAY, backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_delay=DEFAULT_MAX_DELAY, jitter=DEFAULT_JITTER, timeout=DEFAULT_TIMEOUT,
+                 max_errors=0, sleep=time.sleep, clock=time.time):
+        self.initial_delay = initial_delay
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+        self.max_errors = max_errors
+        self.errors = 0
+        self.sleep = sleep
+        self.clock = clock
+        self.attempts = 0
+
+    @classmethod
+    def from_params(cls, params, **kwargs):
+        """Build a poller from a I(polling) option, kwargs are passed on as is."""
+        params = dict((k, v) for k, v in (params or {}).items() if v is not None)
+        params.update(kwargs)
+        return cls(**params)
+
+    def delays(self):
+        delay = self.initial_delay
+        while True:
+            yield delay
+            delay = min(self.max_delay, delay * self.backoff_factor)
+
+    def jittered(self, delay):
+        if not self.jitter:
+            return delay
+        return max(0.0, delay * (1 + random.uniform(-self.jitter, self.jitter)))
+
+    def poll(self, check, initial_response=None):
+        """Call check() until it reports completion and return its result.
+
+        check returns a (done, result, response) tuple; the headers of response are
+        consulted for Retry-After. When initial_response is given, the operation has
+        just been started, so the first check happens after a delay rather than at once.
+        Raises PollingTimeout once timeout seconds have elapsed.
+        """
+        deadline = self.clock() + self.timeout
+        delays = self.delays()
+        response = initial_response
+        if initial_response is None:
+            done, result, response = self._check(check)
+            if done:
+                return result
+        while True:
+            delay = retry_after(response)
+            if delay is None:
+                delay = self.jittered(next(delays))
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                raise PollingTimeout('Operation did not complete within {0} seconds'.format(self.timeout))
+            self.sleep(min(delay, remaining))
+            done, result, response = self._check(check)
+            if done:
+                return result
+
+    def _check(self, check):
+        self.attempts += 1
+        try:
+            result = check()
+        except Exception:
+            self.errors += 1
+            if self.errors > self.max_errors:
+                raise
+            return False, None, None
+        self.errors = 0
+        return result
@@ -0,0 +1,50 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_broker import (
+    DEVELOPMENT_BASE_URL, BrokerClient, broker_socket
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_throttle import Governor, ThrottledClient, throttle_enabled
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_trace import TracedClient, Tracer
+
+
+def get_rest_client(module, rp_mode='production'):
+    """Return the client used by a module to talk to the resource provider.
+
+    When a broker is listening on ARO_BROKER_SOCKET the queries are forwarded to it,
+    authenticated with the credential of the broker rather than the auth options of
+    the module; otherwise a GenericRestClient is built the usual way. rp_mode=development points
+    the client at a local RP with a self-signed certificate. Unless ARO_THROTTLE is
+    false, requests are paced by the subscription governor of aro_throttle. Every
+    request is recorded by the Tracer of aro_trace, kept in module.tracer and shared
+    by all the clients of the module.
+    """
+    resource_manager = module._cloud_environment.endpoints.resource_manager
+    development = rp_mode == "development"
+
+    socket_path = broker_socket(module.log)
+    if socket_path:
+        module.log('Using the broker listening on {0}'.format(socket_path))
+        client = BrokerClient(socket_path,
+                              module.subscription_id,
+                              resource_manager,
+                              base_url=DEVELOPMENT_BASE_URL if development else resource_manager,
+                              verify=not development)
+    else:
+        client = module.get_mgmt_svc_client(GenericRestClient, base_url=resource_manager)
+        # RP_MODE=development hack
+        if development:
+            client._client._base_url = DEVELOPMENT_BASE_URL
+            client._client._pipeline._transport.connection_config.verify = False
+
+    if throttle_enabled():
+        client = ThrottledClient(client, Governor.for_subscription(module.subscription_id, log=module.log))
+    # a module building several clients keeps one tracer for all of them
+    if getattr(module, 'tracer', None) is None:
+        module.tracer = Tracer.from_environment(type(module).__name__, module.log)
+    return TracedClient(client, module.tracer)
@@ -0,0 +1,191 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Deletion of a cluster and the resources around it as concurrent async operations.
+
+Each Deletion issues one DELETE and polls the operation it starts, once the
+deletions it depends on have succeeded: the identities and the resource group of
+a cluster can only go once the cluster is gone, but not after each other.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import (
+    FAILED, SUCCEEDED, TERMINAL_STATUSES, operation_from_response
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import MAX_POLLING_ERRORS, Poller, poll_operation
+
+
+IDENTITY_API_VERSION = '2023-01-31'
+RESOURCE_GROUP_API_VERSION = '2021-04-01'
+
+IN_PROGRESS = 'InProgress'
+# The resource was already gone
+ABSENT = 'Absent'
+# A deletion this one depends on did not succeed
+SKIPPED = 'Skipped'
+
+DELETE_STATUS_CODES = [200, 202, 204, 404]
+
+RESOURCE_GROUP_RE = re.compile(r'^/subscriptions/([^/]+)/resourcegroups/([^/]+)', re.IGNORECASE)
+
+
+def resource_group_url(subscription_id, resource_group):
+    return '/subscriptions/{0}/resourcegroups/{1}'.format(subscription_id, resource_group)
+
+
+def resource_group_of(resource_id):
+    """Return the (subscription id, resource group) of a resource id, lower cased, or None."""
+    match = RESOURCE_GROUP_RE.match(resource_id or '')
+    if match is None:
+        return None
+    return match.group(1).lower(), match.group(2).lower()
+
+
+def cluster_identities(cluster):
+    """Resource ids of the cluster MSI and the platform workload identities of a cluster document."""
+    ids = list(((cluster.get('identity') or {}).get('userAssignedIdentities') or {}).keys())
+    profile = (cluster.get('properties') or {}).get('platformWorkloadIdentityProfile') or {}
+    for identity in (profile.get('platformWorkloadIdentities') or {}).values():
+        if identity.get('resourceId'):
+            ids.append(identity['resourceId'])
+    return ids
+
+
+def query(client, url, method, api_version, header_parameters, status_code):
+    # A polling timeout of 0 hands back the initial response untouched, headers included.
+    # The client adds per-request headers to the dict it is given, which the workers must not share
+    return client.query(url,
+                        method,
+                        {'api-version': api_version},
+                        dict(header_parameters),
+                        None,
+                        status_code,
+                        0,
+                        30)
+
+
+def start_deletion(client, url, api_version, rp_mode, header_parameters):
+    """Send the DELETE of url.
+
+    Returns (status, operation, response): the operation handle to poll while the
+    status is InProgress, or None once the resource is gone.
+    """
+    response = query(client, url, 'DELETE', api_version, header_parameters, DELETE_STATUS_CODES)
+    if response.status_code == 404:
+        return ABSENT, None, response
+    if response.status_code in (200, 204):
+        return SUCCEEDED, None, response
+    return IN_PROGRESS, operation_from_response(response, url, 'DELETE', api_version, rp_mode), response
+
+
+def check_deletion(client, operation, header_parameters):
+    """Poll a deletion once, returns (status, error, response).
+
+    Without a status monitor, the deletion has succeeded once the resource is gone.
+    """
+    status, progress, response, resource = poll_operation(client, operation, dict(header_parameters))
+    return status, progress.get('error'), response
+
+
+class Deletion(object):
+    """DELETE of one resource, started once the deletions in depends_on have succeeded."""
+
+    def __init__(self, name, client, url, api_version, rp_mode='production', depends_on=()):
+        self.name = name
+        self.client = client
+        self.url = url
+        self.api_version = api_version
+        self.rp_mode = rp_mode
+        self.depends_on = list(depends_on)
+        self.status = None
+        self.error = None
+        self.operation = None
+        self.attempts = 0
+        self.started = None
+        self.finished = None
+        self.done = threading.Event()
+
+    def result(self):
+        result = dict(status=self.status, url=self.url)
+        if self.error is not None:
+            result['error'] = self.error
+        if self.started is not None:
+            result['started'] = self.started
+            result['finished'] = self.finished
+            result['elapsed'] = self.finished - self.started
+            result['attempts'] = self.attempts
+        return result
+
+
+class Teardown(object):
+    """Run a graph of Deletions concurrently, each one as soon as its dependencies are done.
+
+    Deletions have to be added after the ones they depend on. The pool picks them up
+    in that order, so a worker only ever waits for deletions which are already running.
+    """
+
+    def __init__(self, header_parameters, polling=None, max_workers=8, check_mode=False):
+        self.header_parameters = header_parameters
+        self.polling = polling
+        self.max_workers = max_workers
+        self.check_mode = check_mode
+        self.deletions = []
+
+    def add(self, name, client, url, api_version, rp_mode='production', depends_on=()):
+        missing = [d.name for d in depends_on if d not in self.deletions]
+        if missing:
+            raise ValueError('{0} depends on {1}, which have to be added first'.format(name, ', '.join(missing)))
+        deletion = Deletion(name, client, url, api_version, rp_mode, depends_on)
+        self.deletions.append(deletion)
+        return deletion
+
+    def run(self):
+        """Delete everything and return the result of each deletion by name."""
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            list(executor.map(self.delete, self.deletions))
+        return dict((d.name, d.result()) for d in self.deletions)
+
+    def delete(self, deletion):
+        """Run on a worker thread, so errors are recorded on the deletion, not raised."""
+        try:
+            for dependency in deletion.depends_on:
+                dependency.done.wait()
+            blocked = [d.name for d in deletion.depends_on if d.status not in (SUCCEEDED, ABSENT)]
+            if blocked:
+                deletion.status = SKIPPED
+                deletion.error = 'Not deleted because {0} could not be deleted'.format(', '.join(blocked))
+                return
+            deletion.started = time.time()
+            if self.check_mode:
+                response = query(deletion.client, deletion.url, 'GET', deletion.api_version, self.header_parameters, [200, 404])
+                deletion.status = SUCCEEDED if response.status_code == 200 else ABSENT
+                return
+            deletion.status, deletion.operation, response = start_deletion(deletion.client,
+                                                                           deletion.url,
+                                                                           deletion.api_version,
+                                                                           deletion.rp_mode,
+                                                                           self.header_parameters)
+            if deletion.operation is not None:
+                poller = Poller.from_params(self.polling, max_errors=MAX_POLLING_ERRORS)
+                try:
+                    deletion.status, deletion.error = poller.poll(lambda: self.check(deletion), response)
+                finally:
+                    deletion.attempts = poller.attempts
+        except Exception as exc:
+            deletion.status = FAILED
+            deletion.error = str(exc)
+        finally:
+            deletion.finished = time.time()
+            deletion.done.set()
+
+    def check(self, deletion):
+        status, error, response = check_deletion(deletion.client, deletion.operation, self.header_parameters)
+        return status in TERMINAL_STATUSES, (status, error), response
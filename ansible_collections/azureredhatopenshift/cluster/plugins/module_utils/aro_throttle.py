@@ -0,0 +1,156 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Client-side pacing of ARM requests, shared by every module run on this host.
+
+ARM limits the number of reads and writes per subscription and reports how many
+are left in the x-ms-ratelimit-remaining-subscription-reads/writes headers. Each
+Ansible fork is a separate process, so the governor keeps one token bucket per
+subscription and kind of request in a small state file guarded by a file lock.
+The bucket refills at the documented ARM rate and is lowered to what ARM reports
+as remaining, so concurrent runs slow down before ARM answers 429.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import threading
+import time
+
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import CACHE_DIR_ENV, DEFAULT_CACHE_DIR, locked_update
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import response_headers
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import retry_after
+
+
+THROTTLE_ENV = 'ARO_THROTTLE'
+REMAINING_HEADER = 'x-ms-ratelimit-remaining-subscription-{0}'
+READS = 'reads'
+WRITES = 'writes'
+
+# (bucket capacity, refill per second) of the ARM subscription limits
+LIMITS = {
+    READS: (12000, 12000 / 3600.0),
+    WRITES: (1200, 1200 / 3600.0),
+}
+
+# Delay before retrying a 429 which carries no Retry-After header
+DEFAULT_THROTTLED_DELAY = 30
+MAX_THROTTLED_RETRIES = 5
+
+
+def request_kind(method):
+    return READS if method.upper() in ('GET', 'HEAD') else WRITES
+
+
+def throttle_enabled():
+    return os.environ.get(THROTTLE_ENV, 'true').lower() not in ('0', 'false', 'no', 'off')
+
+
+class Governor(object):
+    """Token buckets of one subscription, persisted in path and shared between processes.
+
+    A request takes a token even when none is left, so the bucket goes into debt and
+    the caller sleeps until the debt is paid back. The lock is only held while the
+    state file is updated, never while sleeping. When the state file can not be
+    written, e.g. a read-only home directory, requests go through unpaced.
+    """
+
+    def __init__(self, path, limits=None, sleep=time.sleep, clock=time.time, log=None):
+        self.path = path
+        self.limits = limits or LIMITS
+        self.sleep = sleep
+        self.clock = clock
+        self.log = log
+
+    @classmethod
+    def for_subscription(cls, subscription_id, directory=None, log=None):
+        directory = directory or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        return cls(os.path.join(os.path.expanduser(directory), 'throttle', subscription_id + '.json'), log=log)
+
+    def acquire(self, kind):
+        """Take a token for a request of kind, sleeping first if the bucket is empty."""
+        def reserve(state, now):
+            bucket = self.bucket(state, kind, now)
+            bucket['tokens'] -= 1
+            wait = -bucket['tokens'] / self.limits[kind][1] if bucket['tokens'] < 0 else 0
+            return max(wait, state.get('blocked_until', 0) - now)
+
+        wait = self.update(reserve)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def observe(self, kind, response):
+        """Align the bucket with the remaining quota reported by ARM, and back off on a 429."""
+        remaining = response_headers(response).get(REMAINING_HEADER.format(kind))
+        throttled = response.status_code == 429
+
+        def record(state, now):
+            bucket = self.bucket(state, kind, now)
+            if remaining is not None:
+                try:
+                    bucket['tokens'] = min(bucket['tokens'], float(remaining))
+                except ValueError:
+                    pass
+            if throttled:
+                delay = retry_after(response)
+                state['blocked_until'] = now + (DEFAULT_THROTTLED_DELAY if delay is None else delay)
+                return state['blocked_until'] - now
+            return 0
+
+        return self.update(record)
+
+    def bucket(self, state, kind, now):
+        capacity, rate = self.limits[kind]
+        bucket = state.setdefault(kind, dict(tokens=capacity, updated=now))
+        bucket['tokens'] = min(capacity, bucket['tokens'] + max(0, now - bucket['updated']) * rate)
+        bucket['updated'] = now
+        return bucket
+
+    def update(self, change):
+        try:
+            return locked_update(self.path, lambda state: change(state, self.clock()))
+        except (IOError, OSError) as exc:
+            # pacing is best effort, it must not break the request itself
+            if self.log is not None:
+                self.log('Not pacing the request, the throttle state {0} is not writable: {1}'.format(self.path, exc))
+            return 0
+
+
+class ThrottledClient(object):
+    """Wrap a GenericRestClient so that every query is paced by a Governor.
+
+    A 429 the caller did not expect is retried after the delay ARM asked for,
+    instead of failing the module.
+    """
+
+    def __init__(self, client, governor, max_retries=MAX_THROTTLED_RETRIES):
+        self.client = client
+        self.governor = governor
+        self.max_retries = max_retries
+        self.local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def stats(self):
+        """Retries and seconds spent waiting for the governor by the last query of this thread."""
+        return dict(retries=getattr(self.local, 'retries', 0), throttle_wait=getattr(self.local, 'throttle_wait', 0.0))
+
+    def query(self, url, method, query_parameters, header_parameters, body, expected_status_codes,
+              polling_timeout, polling_interval):
+        kind = request_kind(method)
+        retry = 429 not in expected_status_codes
+        status_codes = list(expected_status_codes) + [429] if retry else expected_status_codes
+        self.local.throttle_wait = 0.0
+        for attempt in range(self.max_retries + 1):
+            self.local.retries = attempt
+            self.local.throttle_wait += self.governor.acquire(kind)
+            response = self.client.query(url, method, query_parameters, header_parameters, body, status_codes,
+                                         polling_timeout, polling_interval)
+            self.governor.observe(kind, response)
+            if not (retry and response.status_code == 429):
+                return response
+        raise Exception('ARM throttled {0} {1} {2} times in a row'.format(method, url, self.max_retries + 1))
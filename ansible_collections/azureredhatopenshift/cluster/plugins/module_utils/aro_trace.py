@@ -0,0 +1,210 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+"""Instrumentation of the requests the modules send to ARM and the resource provider.
+
+Every query is recorded with its method, URL template, status, latency, sizes and
+the retries and throttling delays of aro_throttle. When ARO_TRACE_FILE is set the
+records are appended to that file in the OTLP/JSON file format read by the
+otlpjsonfile receiver of the OpenTelemetry Collector: one ExportTraceServiceRequest
+per line, holding the span of one request, so that the spans of all the module runs
+of a playbook can be collected in one place.
+Set ARO_TRACE_ID to the same 32 hex digits for all the runs to put them in one trace.
+"""
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import binascii
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+
+TRACE_FILE_ENV = 'ARO_TRACE_FILE'
+TRACE_ID_ENV = 'ARO_TRACE_ID'
+
+# Path segments followed by a resource name, and the placeholder replacing that name
+URL_PARAMETERS = {
+    'subscriptions': '{subscriptionId}',
+    'resourcegroups': '{resourceGroupName}',
+    'openshiftclusters': '{resourceName}',
+    'locations': '{location}',
+    'operationsstatus': '{operationId}',
+    'operationresults': '{operationId}',
+    'userassignedidentities': '{resourceName}',
+    'roleassignments': '{roleAssignmentName}',
+    'deployments': '{deploymentName}',
+}
+
+TRACE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+INSTRUMENTATION_SCOPE = 'azureredhatopenshift.cluster'
+
+# OTLP/JSON encodes enums as their integer values
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_OK = 1
+STATUS_CODE_ERROR = 2
+
+
+def url_template(url):
+    """Return the path of url with resource names replaced by placeholders."""
+    segments = urlparse(url).path.strip('/').split('/')
+    for i in range(1, len(segments)):
+        placeholder = URL_PARAMETERS.get(segments[i - 1].lower())
+        if placeholder:
+            segments[i] = placeholder
+    return '/' + '/'.join(segments)
+
+
+def random_id(size):
+    return binascii.hexlify(os.urandom(size)).decode('ascii')
+
+
+def trace_id():
+    value = os.environ.get(TRACE_ID_ENV, '').lower()
+    return value if TRACE_ID_RE.match(value) else random_id(16)
+
+
+def attribute(key, value):
+    """Encode an attribute the way OTLP/JSON does."""
+    if isinstance(value, bool):
+        return dict(key=key, value=dict(boolValue=value))
+    if isinstance(value, int):
+        return dict(key=key, value=dict(intValue=str(value)))
+    if isinstance(value, float):
+        return dict(key=key, value=dict(doubleValue=value))
+    return dict(key=key, value=dict(stringValue=str(value)))
+
+
+def body_size(response):
+    try:
+        body = response.body() if hasattr(response, 'body') else response.text()
+    except Exception:
+        return None
+    return len(body) if body is not None else None
+
+
+class Tracer(object):
+    """Collect request records, and export them as spans when a trace file is set."""
+
+    def __init__(self, service, path=None, log=None):
+        self.service = service
+        self.path = path
+        self.log = log
+        self.trace_id = trace_id()
+        self.records = []
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, service, log=None):
+        return cls(service, os.environ.get(TRACE_FILE_ENV), log)
+
+    def record(self, record):
+        with self.lock:
+            self.records.append(record)
+        if self.log:
+            self.log('{method} {url_template} {status_code} in {latency:.3f}s, {response_bytes} bytes, {retries} retries'.format(
+                **record))
+        if self.path:
+            self.export(record)
+
+    def span(self, record):
+        attributes = {
+            'http.request.method': record['method'],
+            'url.template': record['url_template'],
+            'http.response.status_code': record['status_code'],
+            'http.request.body.size': record['request_bytes'],
+            'http.response.body.size': record['response_bytes'],
+            'http.request.resend_count': record['retries'],
+            'aro.throttle.wait': record['throttle_wait'],
+        }
+        if record.get('error'):
+            attributes['error.type'] = record['error']
+        return dict(
+            traceId=self.trace_id,
+            spanId=random_id(8),
+            name='{0} {1}'.format(record['method'], record['url_template']),
+            kind=SPAN_KIND_CLIENT,
+            startTimeUnixNano=str(int(record['start'] * 1e9)),
+            endTimeUnixNano=str(int((record['start'] + record['latency']) * 1e9)),
+            attributes=[attribute(k, v) for k, v in attributes.items() if v is not None],
+            status=dict(code=STATUS_CODE_ERROR if record.get('error') else STATUS_CODE_OK),
+        )
+
+    def request(self, spans):
+        """Wrap spans in an OTLP ExportTraceServiceRequest."""
+        return dict(resourceSpans=[dict(
+            resource=dict(attributes=[attribute('service.name', self.service)]),
+            scopeSpans=[dict(
+                scope=dict(name=INSTRUMENTATION_SCOPE),
+                spans=spans,
+            )],
+        )])
+
+    def export(self, record):
+        line = json.dumps(self.request([self.span(record)]), sort_keys=True) + '\n'
+        try:
+            # a single append of a short line is atomic enough for concurrent writers
+            with open(self.path, 'a') as f:
+                f.write(line)
+        except (IOError, OSError) as exc:
+            if self.log:
+                self.log('Could not write trace to {0}: {1}'.format(self.path, exc))
+
+    def summary(self):
+        with self.lock:
+            records = list(self.records)
+        return dict(
+            requests=len(records),
+            latency=sum(r['latency'] for r in records),
+            throttle_wait=sum(r['throttle_wait'] for r in records),
+            retries=sum(r['retries'] for r in records),
+        )
+
+
+class TracedClient(object):
+    """Wrap a client so that every query is recorded by a Tracer."""
+
+    def __init__(self, client, tracer):
+        self.client = client
+        self.tracer = tracer
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+    def query(self, url, method, query_parameters, header_parameters, body, expected_status_codes,
+              polling_timeout, polling_interval):
+        record = dict(method=method,
+                      url_template=url_template(url),
+                      status_code=None,
+                      request_bytes=len(json.dumps(body)) if body is not None else 0,
+                      response_bytes=None,
+                      retries=0,
+                      throttle_wait=0.0,
+                      start=time.time())
+        started = time.time()
+        try:
+            response = self.client.query(url, method, query_parameters, header_parameters, body, expected_status_codes,
+                                         polling_timeout, polling_interval)
+        except Exception as exc:
+            record['error'] = type(exc).__name__
+            raise
+        else:
+            record['status_code'] = response.status_code
+            record['response_bytes'] = body_size(response)
+        finally:
+            record['latency'] = time.time() - started
+            stats = getattr(self.client, 'stats', None)
+            if stats is not None:
+                record.update(stats())
+            self.tracer.record(record)
+        return response
@@ -0,0 +1,106 @@
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import bisect
+import re
+
+
+VERSION_RE = re.compile(r'^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[-+](.*))?$')
+
+
+def version_key(version):
+    """Sort key ordering OpenShift version strings numerically.
+
+    A pre-release (4.16.0-rc.1) sorts before its release. Strings that are not
+    versions sort before all versions, by their text.
+    """
+    match = VERSION_RE.match(version or '')
+    if not match:
+        return (0, (), 0, version or '')
+    numbers = tuple(int(x or 0) for x in match.group(1, 2, 3))
+    suffix = match.group(4)
+    return (1, numbers, 0 if suffix else 1, suffix or '')
+
+
+def latest(versions):
+    """Return the highest of versions, or None if there are none."""
+    versions = list(versions)
+    if not versions:
+        return None
+    return max(versions, key=version_key)
+
+
+def floor_key(version):
+    """Lowest sort key of version, i.e. below its pre-releases when it has no suffix."""
+    key = version_key(version)
+    if key[0] and key[2]:
+        return (1, key[1], 0, '')
+    return key
+
+
+def next_prefix(version):
+    """Return the version right above every version starting with the given prefix.
+
+    next_prefix('4.16') is '4.17', next_prefix('4') is '5'.
+    """
+    match = VERSION_RE.match(version)
+    if not match or match.group(4):
+        raise ValueError('Invalid version prefix: {0}'.format(version))
+    numbers = [int(x) for x in match.group(1, 2, 3) if x is not None]
+    numbers[-1] += 1
+    return '.'.join(str(x) for x in numbers)
+
+
+class VersionIndex(object):
+    """Sorted index over version strings answering range and constraint queries by bisection."""
+
+    OPERATORS = ('>=', '<=', '==', '!=', '>', '<', '=')
+
+    def __init__(self, versions):
+        self.versions = sorted(set(v for v in versions if VERSION_RE.match(v or '')), key=version_key)
+        self.keys = [version_key(v) for v in self.versions]
+
+    def latest(self, prefix=None):
+        """Return the newest version, or the newest starting with prefix (e.g. '4.16')."""
+        if not prefix:
+            return self.versions[-1] if self.versions else None
+        return self.resolve('>={0},<{1}'.format(prefix, next_prefix(prefix)))
+
+    def resolve(self, constraint):
+        """Return the newest version satisfying a constraint such as '>=4.15,<4.17'.
+
+        Clauses are comma separated. A clause without operator is a prefix, so
+        '4.16' selects the newest 4.16.z. Returns None if no version matches.
+        """
+        low, high = 0, len(self.versions)
+        excluded = set()
+        for clause in [c.strip() for c in constraint.split(',') if c.strip()]:
+            operator = next((op for op in self.OPERATORS if clause.startswith(op)), None)
+            if operator is None:
+                low = max(low, bisect.bisect_left(self.keys, floor_key(clause)))
+                high = min(high, bisect.bisect_left(self.keys, floor_key(next_prefix(clause))))
+                continue
+            version = clause[len(operator):].strip()
+            if not VERSION_RE.match(version):
+                raise ValueError('Invalid version constraint: {0}'.format(clause))
+            if operator == '>=':
+                low = max(low, bisect.bisect_left(self.keys, floor_key(version)))
+            elif operator == '>':
+                low = max(low, bisect.bisect_right(self.keys, version_key(version)))
+            elif operator == '<=':
+                high = min(high, bisect.bisect_right(self.keys, version_key(version)))
+            elif operator == '<':
+                high = min(high, bisect.bisect_left(self.keys, floor_key(version)))
+            elif operator == '!=':
+                excluded.add(version_key(version))
+            else:
+                low = max(low, bisect.bisect_left(self.keys, version_key(version)))
+                high = min(high, bisect.bisect_right(self.keys, version_key(version)))
+        for i in range(high - 1, low - 1, -1):
+            if self.keys[i] not in excluded:
+                return self.versions[i]
+        return None
@@ -5,7 +5,6 @@
 # GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
 
 from __future__ import absolute_import, division, print_function
-from types import LambdaType
 __metaclass__ = type
 
 
@@ -15,22 +14,191 @@ module: azure_rm_managedidentity
 version_added: '1.2.0'
 short_description: Manage Azure Managed Identities
 description:
-    - Create, update and delete identities
+    - Create and delete user assigned managed identities and their role assignments, concurrently.
+    - Meant to prepare the cluster and platform workload identities of an Azure Red Hat OpenShift cluster.
 options:
+    resource_group:
+        description:
+            - The name of the resource group holding the identities.
+        required: true
+        type: str
+    location:
+        description:
+            - Location of the identities. Defaults to the location of the resource group.
+        type: str
+    identities:
+        description:
+            - The identities to manage.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description:
+                    - Name of the identity.
+                required: true
+                type: str
+            operator_name:
+                description:
+                    - Name of the OpenShift operator using this identity.
+                    - Identities with an operator name are returned in I(platform_workload_identities).
+                type: str
+            role_assignments:
+                description:
+                    - Roles granted to the identity.
+                type: list
+                elements: dict
+                default: []
+                suboptions:
+                    role_definition_id:
+                        description:
+                            - Resource id of the role definition.
+                        required: true
+                        type: str
+                    scope:
+                        description:
+                            - Scope of the role assignment, e.g. the id of a resource group.
+                        required: true
+                        type: str
+    max_workers:
+        description:
+            - Maximum number of identities created or deleted concurrently.
+        type: int
+        default: 8
+    propagation:
+        description:
+            - How to wait for a new identity to replicate before granting it roles, and for its role
+              assignments to become readable.
+            - Waiting stops as soon as the replication is seen, and the module fails after I(timeout) seconds.
+        type: dict
+        default: {}
+        suboptions:
+            initial_delay:
+                description:
+                    - Seconds before probing again after the first failed probe.
+                type: float
+                default: 1
+            backoff_factor:
+                description:
+                    - Factor applied to the delay after each failed probe.
+                type: float
+                default: 2
+            max_delay:
+                description:
+                    - Upper bound of the delay between two probes.
+                type: float
+                default: 15
+            jitter:
+                description:
+                    - Fraction by which each delay is randomized.
+                type: float
+                default: 0.2
+            timeout:
+                description:
+                    - Seconds after which waiting for the replication fails.
+                type: float
+                default: 600
+    state:
+        description:
+            - Assert the state of the identities. Use C(present) to create them and C(absent) to delete them
+              together with their role assignments.
+        type: str
+        default: present
+        choices:
+            - present
+            - absent
+extends_documentation_fragment:
+    - azure.azcollection.azure
+    - azure.azcollection.azure_tags
+author:
+    - haiyuazhang (@haiyuazhang)
 '''
+
 EXAMPLES = '''
+- name: Create the platform workload identities of a cluster
+  azure_rm_managedidentity:
+    resource_group: myResourceGroup
+    identities:
+      - name: myCluster-cloud-controller-manager
+        operator_name: cloud-controller-manager
+        role_assignments:
+          - role_definition_id: /subscriptions/xx-xx-xx-xx-xx/providers/Microsoft.Authorization/roleDefinitions/a1f96423-95ce-4224-ab27-4e3dc72facd4
+            scope: /subscriptions/xx-xx-xx-xx-xx/resourceGroups/myResourceGroup
+      - name: myCluster-ingress
+        operator_name: ingress
+        role_assignments:
+          - role_definition_id: /subscriptions/xx-xx-xx-xx-xx/providers/Microsoft.Authorization/roleDefinitions/0336e1d3-7a87-462b-b6db-342b63f7802c
+            scope: /subscriptions/xx-xx-xx-xx-xx/resourceGroups/myResourceGroup
+  register: identities
+
+- name: Create a cluster with the identities
+  azure_rm_openshiftmanagedcluster:
+    resource_group: myResourceGroup
+    name: myCluster
+    location: eastus
+    platform_workload_identity_profile:
+      platform_workload_identities: "{{ identities.platform_workload_identities }}"
+
+- name: Delete identities
+  azure_rm_managedidentity:
+    resource_group: myResourceGroup
+    identities:
+      - name: myCluster-Cluster
+    state: absent
 '''
+
 RETURN = '''
+identities:
+    description:
+        - The identities, keyed by name.
+    returned: always
+    type: dict
+    contains:
+        id:
+            description:
+                - Resource id of the identity.
+            type: str
+        principal_id:
+            description:
+                - Object id of the service principal of the identity.
+            type: str
+        client_id:
+            description:
+                - Client id of the identity.
+            type: str
+        role_assignments:
+            description:
+                - Resource ids of the role assignments of the identity.
+            type: list
+            elements: str
+        changed:
+            description:
+                - Whether the identity or one of its role assignments was created or deleted.
+            type: bool
+        error:
+            description:
+                - Error raised while managing the identity.
+            type: str
+platform_workload_identities:
+    description:
+        - Identities having an I(operator_name), in the format of
+          I(platform_workload_identity_profile.platform_workload_identities) of
+          M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster).
+    returned: when I(state=present)
+    type: dict
+    sample: {"cloud-controller-manager": {"resource_id": "/subscriptions/xx-xx-xx-xx-xx/resourcegroups/myResourceGroup/providers/Microsoft.ManagedIdentity/userAssignedIdentities/myCluster-cloud-controller-manager"}}
 '''
 
-import time
-import json
-import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
-from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import response_json
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import PROPAGATION_DEFAULTS, Poller, polling_arg_spec
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
 
-class Actions:
-    NoAction, Create, Update, Delete = range(4)
+IDENTITY_API_VERSION = '2023-01-31'
+ROLE_ASSIGNMENT_API_VERSION = '2022-04-01'
+RESOURCE_GROUP_API_VERSION = '2021-04-01'
 
 
 class AzureRMManagedIdentity(AzureRMModuleBaseExt):
@@ -40,63 +208,203 @@ class AzureRMManagedIdentity(AzureRMModuleBaseExt):
                 type='str',
                 required=True
             ),
-            name=dict(
+            location=dict(
                 type='str',
-                required=True
             ),
-            location=dict(
+            identities=dict(
+                type='list',
+                elements='dict',
+                required=True,
+                options=dict(
+                    name=dict(
+                        type='str',
+                        required=True
+                    ),
+                    operator_name=dict(
+                        type='str'
+                    ),
+                    role_assignments=dict(
+                        type='list',
+                        elements='dict',
+                        default=[],
+                        options=dict(
+                            role_definition_id=dict(
+                                type='str',
+                                required=True
+                            ),
+                            scope=dict(
+                                type='str',
+                                required=True
+                            )
+                        )
+                    )
+                )
+            ),
+            max_workers=dict(
+                type='int',
+                default=8
+            ),
+            propagation=polling_arg_spec(**PROPAGATION_DEFAULTS),
+            state=dict(
                 type='str',
+                default='present',
+                choices=['present', 'absent']
             ),
         )
         self.resource_group = None
-        self.name = None
+        self.location = None
+        self.identities = None
+        self.max_workers = 8
+        self.propagation = None
+        self.state = None
+        self.tags = None
 
         self.results = dict(changed=False)
         self.mgmt_client = None
-        self.state = None
-        self.url = None
-        self.status_code = [200, 201, 202]
-        self.to_do = Actions.NoAction
 
-        self.body = {}
-        self.body['properties'] = {}
-        self.query_parameters = {}
         self.header_parameters = {}
-
-        self.api_version = '2023-11-22'
-        self.rp_mode = 'production'
         self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
 
-        super(AzureRMOpenShiftManagedClusters, self).__init__(derived_arg_spec=self.module_arg_spec,
-                                                              supports_check_mode=True,
-                                                              supports_tags=True)
+        super(AzureRMManagedIdentity, self).__init__(derived_arg_spec=self.module_arg_spec,
+                                                     supports_check_mode=True,
+                                                     supports_tags=True)
 
     def exec_module(self, **kwargs):
         for key in list(self.module_arg_spec.keys()) + ['tags']:
             if hasattr(self, key):
                 setattr(self, key, kwargs[key])
 
-        response = None
-
-        self.mgmt_client = self.get_mgmt_svc_client(GenericRestClient,
-                                                    base_url=self._cloud_environment.endpoints.resource_manager)
-        self.query_parameters['api-version'] = self.api_version
-        self.results["api_version"] = self.api_version
-        if self.rp_mode != "production":
-            self.results["rp_mode"] = self.rp_mode
-
-        self.url = "/".join([
-            'subscriptions',
-            self.subscription_id,
-            '/resourceGroups',
-            self.resource_group,
-            'providers',
-            'Microsoft.RedHatOpenShift',
-            'openShiftClusters',
-            self.name
-        ])
-        self.url = self.url.replace('{{ subscription_id }}', self.subscription_id)
-        self.url = self.url.replace('{{ resource_group }}', self.resource_group)
-        self.url = self.url.replace('{{ open_shift_managed_cluster_name }}', self.name)
-
-        old_response = self.get_resource()
+        # One client, and its connection pool, is shared by all the workers
+        self.mgmt_client = get_rest_client(self)
+
+        if self.state == 'present' and not self.location:
+            response = self.query(self.resource_group_url(), 'GET', RESOURCE_GROUP_API_VERSION, None, [200])
+            self.location = response_json(response)['location']
+
+        manage = self.create_identity if self.state == 'present' else self.delete_identity
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            statuses = list(executor.map(manage, self.identities))
+
+        self.results['identities'] = dict((i['name'], s) for i, s in zip(self.identities, statuses))
+        self.results['changed'] = any(s['changed'] for s in statuses)
+        if self.state == 'present':
+            self.results['platform_workload_identities'] = dict(
+                (i['operator_name'], dict(resource_id=s.get('id')))
+                for i, s in zip(self.identities, statuses) if i.get('operator_name'))
+
+        failed = sorted(name for name, s in self.results['identities'].items() if s.get('error'))
+        if failed:
+            self.fail('Failed to manage the identities {0}'.format(', '.join(failed)), **self.results)
+        return self.results
+
+    def resource_group_url(self):
+        return '/subscriptions/{0}/resourceGroups/{1}'.format(self.subscription_id, self.resource_group)
+
+    def identity_url(self, name):
+        return self.resource_group_url() + '/providers/Microsoft.ManagedIdentity/userAssignedIdentities/' + name
+
+    def role_assignment_url(self, scope, role_definition_id, principal_id):
+        # The name of a role assignment is derived from what it grants, so that creating it again is a no-op
+        name = uuid.uuid5(uuid.NAMESPACE_URL, '/'.join([scope, role_definition_id, principal_id]).lower())
+        return scope.rstrip('/') + '/providers/Microsoft.Authorization/roleAssignments/' + str(name)
+
+    def create_identity(self, identity):
+        """Create an identity and its role assignments. Runs on a worker thread, so errors are returned, not raised."""
+        status = dict(changed=False, role_assignments=[])
+        try:
+            url = self.identity_url(identity['name'])
+            response = self.query(url, 'GET', IDENTITY_API_VERSION, None, [200, 404])
+            current = response_json(response) if response.status_code == 200 else None
+            if current is None or (self.tags is not None and current.get('tags') != self.tags):
+                status['changed'] = True
+                if self.check_mode:
+                    return status
+                body = dict(location=self.location, tags=self.tags or (current or {}).get('tags') or {})
+                current = response_json(self.query(url, 'PUT', IDENTITY_API_VERSION, body, [200, 201]))
+            properties = current.get('properties', {})
+            status.update(id=current.get('id'),
+                          principal_id=properties.get('principalId'),
+                          client_id=properties.get('clientId'))
+            for assignment in identity['role_assignments']:
+                assignment_id, created = self.create_role_assignment(assignment, status['principal_id'])
+                status['role_assignments'].append(assignment_id)
+                status['changed'] = status['changed'] or created
+        except Exception as exc:
+            status['error'] = str(exc)
+        return status
+
+    def create_role_assignment(self, assignment, principal_id):
+        url = self.role_assignment_url(assignment['scope'], assignment['role_definition_id'], principal_id)
+        response = self.query(url, 'GET', ROLE_ASSIGNMENT_API_VERSION, None, [200, 404])
+        if response.status_code == 200 or self.check_mode:
+            return url, response.status_code != 200
+        body = dict(properties=dict(roleDefinitionId=assignment['role_definition_id'],
+                                    principalId=principal_id,
+                                    # Declaring the type lets ARM skip looking up a principal which may not be replicated yet
+                                    principalType='ServicePrincipal'))
+
+        def create():
+            # 409: the same role is already granted through an assignment with another name
+            response = self.query(url, 'PUT', ROLE_ASSIGNMENT_API_VERSION, body, [200, 201, 400, 409])
+            if response.status_code == 400:
+                error = response_json(response).get('error', {})
+                if error.get('code') != 'PrincipalNotFound':
+                    raise Exception('Error creating role assignment {0}: {1}'.format(url, error.get('message')))
+                self.log('Principal {0} not replicated yet'.format(principal_id))
+                return False, None, response
+            return True, response.status_code, response
+
+        status_code = Poller.from_params(self.propagation).poll(create)
+        if status_code != 409:
+            self.wait_for_role_assignment(url)
+        return url, status_code != 409
+
+    def wait_for_role_assignment(self, url):
+        """Probe the read path of a new role assignment until it has replicated."""
+        def readable():
+            response = self.query(url, 'GET', ROLE_ASSIGNMENT_API_VERSION, None, [200, 404])
+            return response.status_code == 200, None, response
+
+        poller = Poller.from_params(self.propagation)
+        poller.poll(readable)
+        self.log('Role assignment {0} readable after {1} probes'.format(url, poller.attempts))
+
+    def delete_identity(self, identity):
+        """Delete the role assignments of an identity, then the identity itself."""
+        status = dict(changed=False, role_assignments=[])
+        try:
+            url = self.identity_url(identity['name'])
+            response = self.query(url, 'GET', IDENTITY_API_VERSION, None, [200, 404])
+            if response.status_code == 404:
+                return status
+            principal_id = response_json(response).get('properties', {}).get('principalId')
+            status['changed'] = True
+            if self.check_mode:
+                return status
+            for assignment in identity['role_assignments']:
+                assignment_url = self.role_assignment_url(assignment['scope'], assignment['role_definition_id'], principal_id)
+                self.query(assignment_url, 'DELETE', ROLE_ASSIGNMENT_API_VERSION, None, [200, 204])
+                status['role_assignments'].append(assignment_url)
+            self.query(url, 'DELETE', IDENTITY_API_VERSION, None, [200, 204])
+        except Exception as exc:
+            status['error'] = str(exc)
+        return status
+
+    def query(self, url, method, api_version, body, status_code):
+        # The client adds per-request headers to the dict it is given, which the workers must not share
+        return self.mgmt_client.query(url,
+                                      method,
+                                      {'api-version': api_version},
+                                      dict(self.header_parameters),
+                                      body,
+                                      status_code,
+                                      0,
+                                      30)
+
+
+def main():
+    AzureRMManagedIdentity()
+
+
+if __name__ == '__main__':
+    main()
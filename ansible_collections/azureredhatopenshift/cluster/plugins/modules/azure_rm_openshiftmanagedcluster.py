@@ -233,9 +233,28 @@ options:
         choices:
             - absent
             - present
+    wait:
+        description:
+            - Whether to wait for the create, update or delete operation to be completed by the resource provider.
+            - Waiting polls the status monitor of the operation, C(Azure-AsyncOperation) or C(Location), according to I(polling)
+              until its status is terminal. When the resource provider sends no monitor, the provisioning state of the cluster is polled instead.
+            - Transient errors while polling are retried a few times before the module fails.
+            - Use C(false) to return immediately with an I(operation) handle that can be polled later
+              with M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster_operation_info).
+            - With I(state=absent), the deletion is also recorded in I(ledger), for
+              M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster_reaper) to collect later.
+        type: bool
+        default: true
+    ledger:
+        description:
+            - File recording the deletions started with I(wait=false).
+            - Defaults to the C(ARO_LEDGER_FILE) environment variable, else C(ledger.json) in the cache directory.
+        type: path
 extends_documentation_fragment:
     - azure.azcollection.azure
     - azure.azcollection.azure_tags
+    - azureredhatopenshift.cluster.aro_polling
+    - azureredhatopenshift.cluster.aro_cache
 author:
     - Haiyuan Zhang (@haiyuazhang)
 '''
@@ -298,6 +317,34 @@ EXAMPLES = '''
     name: myCluster
     location: eastus
     state: absent
+- name: Start deleting a cluster, leaving it to the reaper
+  azure_rm_openshiftmanagedcluster:
+    resource_group: myResourceGroup
+    name: myCluster
+    location: eastus
+    state: absent
+    wait: false
+- name: Start creating a cluster without waiting for it
+  azure_rm_openshiftmanagedcluster:
+    resource_group: "myResourceGroup"
+    name: "myCluster"
+    location: "eastus"
+    wait: false
+    worker_profiles:
+      - name: worker
+        subnet_id: "/subscriptions/xx-xx-xx-xx-xx/resourceGroups/myResourceGroup/Microsoft.Network/virtualNetworks/myVnet/subnets/worker"
+    master_profile:
+      subnet_id: "/subscriptions/xx-xx-xx-xx-xx/resourceGroups/myResourceGroup/providers/Microsoft.Network/virtualNetworks/myVnet/subnets/master"
+  register: create_op
+- name: Scale the managed outbound IPs of an existing cluster
+  azure_rm_openshiftmanagedcluster:
+    resource_group: "myResourceGroup"
+    name: "myCluster"
+    location: "eastus"
+    network_profile:
+      load_balancer_profile:
+        managed_outbound_ips:
+          count: 2
 '''
 
 RETURN = '''
@@ -501,13 +548,59 @@ properties:
                     returned: always
                     type: str
                     sample: Public
+patch:
+    description:
+        - Fields of an existing cluster that differ from the requested ones and are sent in a PATCH request.
+        - Only fields the resource provider allows to update are considered, changes to other fields are ignored with a warning.
+    returned: when the existing cluster is updated
+    type: dict
+    sample: {"properties": {"networkProfile": {"loadBalancerProfile": {"managedOutboundIps": {"count": 2}}}}}
+progress:
+    description:
+        - Last progress reported by the status monitor of the create, update or delete operation,
+          or derived from the cluster when the resource provider sent no monitor.
+        - Besides I(status), holds I(percent_complete), I(start_time), I(end_time) and I(error) when the resource provider reports them.
+    returned: when the module waited on an operation
+    type: dict
+    sample: {"status": "Succeeded", "percent_complete": 100.0}
+operation:
+    description:
+        - Handle of the long running operation started by the module.
+    returned: when I(wait=false) and the cluster is being created, updated or deleted
+    type: complex
+    contains:
+        async_operation_url:
+            description:
+                - Value of the C(Azure-AsyncOperation) response header.
+            returned: when provided by the resource provider
+            type: str
+        location_url:
+            description:
+                - Value of the C(Location) response header.
+            returned: when provided by the resource provider
+            type: str
+        token:
+            description:
+                - Opaque token to pass to M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster_operation_info).
+            returned: always
+            type: str
 '''
 
-import time
-import json
-import random
 from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
-from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_body import (
+    CLUSTER_BODY_FIELDS, build_body, cluster_arg_spec, set_create_defaults, validate_create_body
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import cache_arg_spec, cache_from_params, conditional_get
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_diff import diff_patch
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_ledger import Ledger, ledger_path
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import (
+    SUCCEEDED, TERMINAL_STATUSES, operation_from_response, response_json
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import (
+    MAX_POLLING_ERRORS, Poller, PollingTimeout, poll_operation, polling_arg_spec
+)
+
 
 class Actions:
     NoAction, Create, Update, Delete = range(4)
@@ -528,197 +621,9 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
                 type='str',
                 required=True
             ),
-            cluster_profile=dict(
-                type='dict',
-                default=dict(),
-                options=dict(
-                    pull_secret=dict(
-                        type='str',
-                        no_log=True,
-                    ),
-                    cluster_resource_group_id=dict(
-                        type='str',
-                    ),
-                    domain=dict(
-                        type='str',
-                    ),
-                    version=dict(
-                        type='str',
-                    ),
-                    fips_validated_modules=dict(
-                        type='str',
-                        choices=['Enabled', 'Disabled'],
-                        default='Disabled'
-                    ),
-                ),
-            ),
-            identity=dict(
-                type="dict",
-                options=dict(
-                    type=dict(
-                        type='str',
-                        choices=[
-                            'None',
-                            'SystemAssigned',
-                            'UserAssigned',
-                            'SystemAssigned,UserAssigned'
-                        ]
-                    ),
-                    user_assigned_identities=dict(
-                        type='dict'
-                    )
-                ),
-            ),
-            service_principal_profile=dict(
-                type='dict',
-                options=dict(
-                    client_id=dict(
-                        type='str',
-                    ),
-                    client_secret=dict(
-                        type='str',
-                        no_log=True,
-                    )
-                )
-            ),
-            network_profile=dict(
-                type='dict',
-                options=dict(
-                    pod_cidr=dict(
-                        type='str',
-                        default='10.128.0.0/14',
-                    ),
-                    service_cidr=dict(
-                        type='str',
-                        default='172.30.0.0/16',
-                    ),
-                    outbound_type=dict(
-                        type='str',
-                        choices=['Loadbalancer', 'UserDefinedRouting']
-                    ),
-                    preconfigured_nsg=dict(
-                        type='str',
-                        choices=['Disabled', 'Enabled'],
-                        default='Disabled'
-                    ),
-                    load_balancer_profile=dict(
-                        type='dict',
-                        options=dict(
-                            managed_outbound_ips=dict(
-                                type='dict',
-                                options=dict(
-                                    count=dict(
-                                        type='int'
-                                    )
-                                )
-                            )
-                        )
-                    )
-                ),
-                default=dict(
-                    pod_cidr="10.128.0.0/14",
-                    service_cidr="172.30.0.0/16"
-                )
-            ),
-            platform_workload_identity_profile=dict(
-              type='dict',
-              options=dict(
-                  upgradeable_to=dict(
-                      type='str'
-                  ),
-                  platform_workload_identities=dict(
-                      type='dict',
-                  )
-              )
-            ),
-            master_profile=dict(
-                type='dict',
-                options=dict(
-                    vm_size=dict(
-                        type='str'
-                    ),
-                    subnet_id=dict(
-                        type='str',
-                        required=True
-                    ),
-                    encryption_at_host=dict(
-                        type='str',
-                        choices=['Disabled', 'Enabled'],
-                        default='Disabled'
-                    ),
-                    disk_encryption_set_id=dict(
-                        type='str'
-                    )
-                )
-            ),
-            worker_profiles=dict(
-                type='list',
-                elements='dict',
-                options=dict(
-                    name=dict(
-                        type='str',
-                        required=True,
-                        choices=['worker']
-                    ),
-                    count=dict(
-                        type='int',
-                        default=3,
-                    ),
-                    vm_size=dict(
-                        type='str'
-                    ),
-                    subnet_id=dict(
-                        type='str',
-                        required=True
-                    ),
-                    disk_size=dict(
-                        type='int',
-                    ),
-                    encryption_at_host=dict(
-                        type='str',
-                        choices=['Disabled', 'Enabled'],
-                        default='Disabled'
-                    ),
-                    disk_encryption_set_id=dict(
-                        type='str'
-                    )
-                )
-            ),
-            api_server_profile=dict(
-                type='dict',
-                options=dict(
-                    visibility=dict(
-                        type='str',
-                        choices=['Public', 'Private'],
-                        default='Public'
-                    ),
-                    url=dict(
-                        type='str',
-                    ),
-                    ip=dict(
-                        type='str',
-                    )
-                )
-            ),
-            ingress_profiles=dict(
-                type='list',
-                elements='dict',
-                options=dict(
-                    name=dict(
-                        type='str',
-                        choices=['default'],
-                        default='default'
-                    ),
-                    visibility=dict(
-                        type='str',
-                        choices=['Public', 'Private'],
-                        default='Public'
-                    ),
-                    ip=dict(
-                        type='str',
-                    )
-                )
-            ),
+            **cluster_arg_spec()
+        )
+        self.module_arg_spec.update(
             provisioning_state=dict(
                 type='str',
             ),
@@ -734,11 +639,28 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
             api_version=dict(
                 type='str',
                 default='2023-11-22'
-            )
+            ),
+            wait=dict(
+                type='bool',
+                default=True
+            ),
+            ledger=dict(
+                type='path'
+            ),
+            polling=polling_arg_spec(),
+            cache=cache_arg_spec()
         )
 
         self.resource_group = None
         self.name = None
+        self.wait = True
+        self.ledger = None
+        self.polling = None
+        self.cache = None
+        self.response_cache = None
+        self.operation = None
+        self.polled_resource = None
+        self.patch = None
 
         self.results = dict(changed=False)
         self.mgmt_client = None
@@ -764,174 +686,23 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
         for key in list(self.module_arg_spec.keys()) + ['tags']:
             if hasattr(self, key):
                 setattr(self, key, kwargs[key])
+            elif key in CLUSTER_BODY_FIELDS:
+                # converted by build_body below
+                continue
             elif kwargs[key] is not None:
-                if key == 'cluster_profile':
-                    cluster_profile = dict()
-                    pull_secret = kwargs[key].get("pull_secret")
-                    if pull_secret:
-                        cluster_profile["pullSecret"] = pull_secret
-                    cluster_resourcegroup = kwargs[key].get("cluster_resource_group_id")
-                    if cluster_resourcegroup:
-                        cluster_profile["resourceGroupId"] = cluster_resourcegroup
-                    domain = kwargs[key].get("domain")
-                    if domain:
-                        cluster_profile["domain"] = domain
-                    version = kwargs[key].get("version")
-                    if version:
-                        cluster_profile["version"] = version
-                    fips_validated_modules = kwargs[key].get("fips_validated_modules")
-                    if fips_validated_modules:
-                        cluster_profile["fipsValidatedModules"] = fips_validated_modules
-
-                    if cluster_profile:
-                        self.body['properties']['clusterProfile'] = cluster_profile
-                elif key == 'service_principal_profile':
-                    spp = dict()
-                    client_id = kwargs[key].get('client_id')
-                    if client_id:
-                        spp["ClientId"] = client_id
-                    client_secret = kwargs[key].get('client_secret')
-                    if client_secret:
-                        spp["clientSecret"] = client_secret
-
-                    if spp:
-                        self.body['properties']['servicePrincipalProfile'] = spp
-                elif key == 'identity':
-                    identity = dict()
-                    type = kwargs[key].get('type')
-                    if type:
-                        identity['type'] = type
-                    uaids = kwargs[key].get('user_assigned_identities')
-                    if uaids:
-                        identity['userAssignedIdentities'] = uaids
-                    if identity:
-                        self.body['identity'] = identity
-                elif key == 'platform_workload_identity_profile':
-                    pwip = dict()
-                    upgradeable_to = kwargs[key].get('upgradeable_to')
-                    if upgradeable_to:
-                        pwip['upgradeableTo'] = upgradeable_to
-                    pwids = dict()
-                    workload_identities = kwargs[key].get('platform_workload_identities', dict())
-                    if workload_identities:
-                        for key, value in workload_identities.items():
-                            pwids[key] = dict(resourceId=value.get('resource_id'))
-                    if pwids:
-                        pwip['platformWorkloadIdentities'] = pwids
-                    if pwip:
-                        self.body['properties']['platformWorkloadIdentityProfile'] = pwip
-                elif key == 'network_profile':
-                    network_profile = dict()
-                    pod_cidr = kwargs[key].get("pod_cidr")
-                    if pod_cidr:
-                        network_profile["podCidr"] = pod_cidr
-                    service_cidr = kwargs[key].get("service_cidr")
-                    if service_cidr:
-                        network_profile['serviceCidr'] = service_cidr
-                    outbound_type = kwargs[key].get("outbound_type")
-                    if outbound_type:
-                        network_profile['outboundType'] = outbound_type
-                    preconfigured_nsg = kwargs[key].get("preconfigured_nsg")
-                    if preconfigured_nsg:
-                        network_profile['preconfiguredNSG'] = preconfigured_nsg
-
-                    load_balancer_profile = kwargs[key].get("load_balancer_profile")
-                    if load_balancer_profile:
-                        lbp = dict()
-                        moips = dict()
-                        managed_outbound_ips = load_balancer_profile.get("managed_outbound_ips")
-                        if managed_outbound_ips:
-                            managed_outbound_ip_count = managed_outbound_ips.get("count")
-                            if managed_outbound_ip_count:
-                                moips["count"] = managed_outbound_ip_count
-                        if moips:
-                            lbp["managedOutboundIps"] = moips
-                        if lbp:
-                            network_profile["loadBalancerProfile"] = lbp
-
-                    if network_profile:
-                        self.body['properties']['networkProfile'] = network_profile
-                elif key == 'master_profile':
-                    master_profile = {}
-                    subnet_id = kwargs[key].get('subnet_id')
-                    if subnet_id:
-                        master_profile['subnetId'] = kwargs[key].get('subnet_id')
-                    disk_encryption_set_id = kwargs[key].get('disk_encryption_set_id')
-                    if disk_encryption_set_id:
-                        master_profile['encryptionAtHost'] = disk_encryption_set_id
-                    encryption_at_host = kwargs[key].get('encryption_at_host')
-                    if encryption_at_host:
-                        master_profile['encryptionAtHost'] = encryption_at_host
-                    vm_size = kwargs[key].get('vm_size')
-                    if vm_size:
-                        master_profile['vmSize'] = vm_size
-
-                    if master_profile:
-                        self.body['properties']['masterProfile'] = master_profile
-                elif key == 'worker_profiles':
-                    worker_profiles = list()
-                    for item in kwargs[key]:
-                        worker_profile = {}
-                        name = item.get('name')
-                        if name:
-                            worker_profile['name'] = name
-                        subnet_id = item.get('subnet_id')
-                        if subnet_id:
-                            worker_profile['subnetId'] = subnet_id
-                        count = item.get('count')
-                        if count:
-                            worker_profile['count'] = count
-                        vm_size = item.get('vm_size')
-                        if vm_size:
-                            worker_profile['vmSize'] = item.get('vm_size')
-                        disk_size = item.get('disk_size')
-                        if disk_size:
-                            worker_profile['diskSizeGB'] = disk_size
-                        encryption_at_host = item.get('encryption_at_host')
-                        if encryption_at_host:
-                            worker_profile['encryptionAtHost'] = encryption_at_host
-                        encryption_set = item.get('disk_encryption_set_id')
-                        if encryption_set:
-                            worker_profile['DiskEncryptionSetId'] = encryption_set
-
-                        if worker_profile:
-                            worker_profiles.append(worker_profile)
-                    if worker_profiles:
-                        self.body['properties']['workerProfiles'] = worker_profiles
-                elif key == 'api_server_profile':
-                    api_server_profile = dict()
-                    visibility = kwargs[key].get("visibility")
-                    if visibility:
-                        api_server_profile["visibility"] = visibility
-                    if api_server_profile:
-                        self.body['properties']['apiserverProfile'] = api_server_profile
-                elif key == 'ingress_profiles':
-                    ingress_profiles = list()
-                    for profile in kwargs[key]:
-                        ip = dict()
-                        name = profile.get("name")
-                        if name:
-                            ip["name"] = name
-                        visibility = profile.get("visibility")
-                        if visibility:
-                            ip["visibility"] = visibility
-                        if ip:
-                            ingress_profiles.append(ip)
-                    if ingress_profiles:
-                        self.body['properties']['ingressProfiles'] = ingress_profiles
-                # elif key == 'provisioning_state':
-                #     self.body['properties']['provisioningState'] = kwargs[key]
-                elif key == 'rp_mode':
+                if key == 'rp_mode':
                     self.rp_mode = kwargs[key]
                 elif key == 'api_version':
                     self.api_version = kwargs[key]
                 else:
                     self.body[key] = kwargs[key]
+        build_body(kwargs, self.body)
 
         response = None
 
-        self.mgmt_client = self.get_mgmt_svc_client(GenericRestClient,
-                                                    base_url=self._cloud_environment.endpoints.resource_manager)
+        self.mgmt_client = get_rest_client(self, self.rp_mode)
+        # Cluster documents are revalidated with their ETag on every read, the TTL only bounds disk usage
+        self.response_cache = cache_from_params(self.cache, 'responses', ttl=3600)
         self.query_parameters['api-version'] = self.api_version
         self.results["api_version"] = self.api_version
         if self.rp_mode != "production":
@@ -961,15 +732,15 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
             if self.state == 'absent':
                 self.to_do = Actions.Delete
             else:
-                modifiers = {}
-                # self.create_compare_modifiers(self.module_arg_spec, '', modifiers)
-                # self.results['modifiers'] = modifiers
-                # self.results['compare'] = []
-                # if 'workProfiles' in self.body['properties']:
-                #     self.body['properties'].pop('workerProfiles')
-                # if not self.default_compare(modifiers, self.body, old_response, '', self.results):
-                #     self.to_do = Actions.Update
-                #self.fail("module doesn't support cluster update yet")
+                self.patch, ignored = diff_patch(self.body, old_response)
+                if ignored:
+                    self.module.warn('The resource provider does not support updating {0}, ignoring the change'.format(
+                        ', '.join(ignored)))
+                if self.patch:
+                    self.to_do = Actions.Update
+                    self.results['patch'] = self.patch
+
+            if self.to_do == Actions.NoAction:
                 self.results["id"] = old_response["id"]
                 self.results["name"] = old_response["name"]
                 self.results["type"] = old_response["type"]
@@ -990,6 +761,8 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
             response = self.create_update_resource()
 
             self.results['changed'] = True
+            if not self.wait:
+                self.results['operation'] = self.operation
             self.log('Creation / Update done')
         elif self.to_do == Actions.Delete:
             self.log('OpenShiftManagedCluster instance deleted')
@@ -998,12 +771,17 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
             if self.check_mode:
                 return self.results
 
-            self.delete_resource()
+            delete_response = self.delete_resource()
+            if not self.wait:
+                Ledger(ledger_path(self.ledger)).record(self.operation, self.subscription_id)
+                self.results['operation'] = self.operation
+                return self.results
 
             # make sure instance is actually deleted, for some Azure resources, instance is hanging around
             # for some time after deletion -- this should be really fixed in Azure
-            while self.get_resource():
-                time.sleep(20)
+            status = self.wait_for_operation(delete_response)
+            if status != SUCCEEDED:
+                self.fail('Error deleting the OpenShiftManagedCluster instance: {0}'.format(self.results['progress']))
         else:
             self.log('OpenShiftManagedCluster instance unchanged')
             self.results['changed'] = False
@@ -1024,88 +802,100 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
     def create_update_resource(self):
 
         if self.to_do == Actions.Create:
-            required_profile_for_creation = ["workerProfiles", "clusterProfile", "masterProfile"]
-
-            if 'properties' not in self.body:
-                self.fail('{0} are required for creating a openshift cluster'.format(
-                    '[worker_profile, cluster_profile, service_principal_profile, master_profile]'))
-            for profile in required_profile_for_creation:
-                if profile not in self.body['properties']:
-                    self.fail('{0} is required for creating a openshift cluster'.format(profile))
-            if "servicePrincipalProfile" not in self.body['properties'] and \
-               "platformWorkloadIdentityProfile" not in self.body['properties']:
-                self.fail('Either service_principal_profile or platform_workload_identity_profile is required for creating an openshift cluster\n{0}'.format(
-                    str(self.body)
-                ))
+            try:
+                validate_create_body(self.body)
+            except ValueError as exc:
+                self.fail(str(exc))
 
             self.set_default()
 
+        # An update only sends the fields that changed, see diff_patch
+        method, body = ('PATCH', self.patch) if self.to_do == Actions.Update else ('PUT', self.body)
         try:
-            # RP_MODE=development hack
-            if self.rp_mode == "development":
-                self.mgmt_client._client._base_url = "https://localhost:8443/"
-                self.mgmt_client._client._pipeline._transport.connection_config.verify = False
-
+            # A polling timeout of 0 hands back the initial response untouched, headers included;
+            # waiting is done by self.wait_for instead of the SDK poller
             response = self.mgmt_client.query(self.url,
-                                              'PUT',
+                                              method,
                                               self.query_parameters,
                                               self.header_parameters,
-                                              self.body,
+                                              body,
                                               self.status_code,
-                                              600,
+                                              0,
                                               30)
         except Exception as exc:
             self.log('Error attempting to create the OpenShiftManagedCluster instance.')
             self.fail('Error creating the OpenShiftManagedCluster instance: {0}'
                 '\n{1}\n{2}'.format(str(self.body), str(exc), str(self.results)))
-        if hasattr(response, 'body'):
-            response = json.loads(response.body())
-        elif hasattr(response, 'context'):
-            response = response.context['deserialized_data']
-        else:
-            self.fail("Create or Updating fail, no match message return, return info as {0}".format(response))
-
-        return response
+        self.operation = operation_from_response(response, self.url, method, self.api_version, self.rp_mode)
+        if not self.wait:
+            return response_json(response)
+
+        status = self.wait_for_operation(response)
+        if status != SUCCEEDED:
+            self.fail('Error creating or updating the OpenShiftManagedCluster instance, the operation ended with status {0}: {1}'
+                      .format(status, self.results['progress'].get('error', status)))
+        if self.polled_resource:
+            # no status monitor, the cluster itself was polled
+            return self.polled_resource
+        return self.get_resource()
 
     def delete_resource(self):
         # self.log('Deleting the OpenShiftManagedCluster instance {0}'.format(self.))
         try:
-            if self.rp_mode == "development":
-                self.mgmt_client._client._base_url = "https://localhost:8443/"
-                self.mgmt_client._client._pipeline._transport.connection_config.verify = False
-
             response = self.mgmt_client.query(self.url,
                                               'DELETE',
                                               self.query_parameters,
                                               self.header_parameters,
                                               None,
                                               self.status_code,
-                                              600,
+                                              0,
                                               30)
         except Exception as e:
             self.log('Error attempting to delete the OpenShiftManagedCluster instance.')
             self.fail('Error deleting the OpenShiftManagedCluster instance: {0}'.format(str(e)))
+        self.operation = operation_from_response(response, self.url, 'DELETE', self.api_version, self.rp_mode)
 
-        return True
+        return response
+
+    def wait_for(self, check, initial_response):
+        poller = Poller.from_params(self.polling, max_errors=MAX_POLLING_ERRORS)
+        try:
+            result = poller.poll(check, initial_response)
+        except PollingTimeout as exc:
+            self.fail('Error waiting for the OpenShiftManagedCluster instance: {0}'.format(str(exc)))
+        except Exception as exc:
+            self.fail('Error polling the OpenShiftManagedCluster instance after {0} attempts: {1}'.format(poller.attempts, str(exc)))
+        self.log('OpenShiftManagedCluster instance polled {0} times'.format(poller.attempts))
+        return result
+
+    def wait_for_operation(self, initial_response):
+        """Wait for self.operation to reach a terminal status and return it.
+
+        When the resource provider sent no status monitor, the cluster itself is
+        polled and the last document read is kept in self.polled_resource.
+        """
+        return self.wait_for(self.check_operation, initial_response)
+
+    def check_operation(self):
+        # errors are retried, then reported, by self.wait_for
+        status, progress, response, self.polled_resource = poll_operation(self.mgmt_client,
+                                                                           self.operation,
+                                                                           self.header_parameters,
+                                                                           self.response_cache)
+        self.results['progress'] = progress
+        self.log('OpenShiftManagedCluster operation progress: {0}'.format(progress))
+        return status in TERMINAL_STATUSES, status, response
 
     def get_resource(self):
         # self.log('Checking if the OpenShiftManagedCluster instance {0} is present'.format(self.))
         found = False
         try:
-            if self.rp_mode == "development":
-                self.mgmt_client._client._base_url = "https://localhost:8443/"
-                self.mgmt_client._client._pipeline._transport.connection_config.verify = False
-
-            response = self.mgmt_client.query(self.url,
-                                              'GET',
-                                              self.query_parameters,
-                                              self.header_parameters,
-                                              None,
-                                              self.status_code,
-                                              600,
-                                              30)
-            found = True
-            response = json.loads(response.body())
+            status, response, raw_response = conditional_get(self.mgmt_client,
+                                                             self.response_cache,
+                                                             self.url,
+                                                             self.query_parameters,
+                                                             self.header_parameters,
+                                                             [200])
             found = True
             self.log("Response : {0}".format(response))
             # self.log("OpenShiftManagedCluster instance : {0} found".format(response.name))
@@ -1116,46 +906,8 @@ class AzureRMOpenShiftManagedClusters(AzureRMModuleBaseExt):
 
         return False
 
-#    def random_id(self):
-#        import random
-#        return ''.join(random.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(8))
-
-# Added per Mangirdas Judeikis (RED HAT INC) to fix first letter of cluster domain beginning with digit ; currently not supported
-    def random_id(self):
-        random_id = (''.join(random.choice('abcdefghijklmnopqrstuvwxyz')) +
-                     ''.join(random.choice('abcdefghijklmnopqrstuvwxyz1234567890')
-                             for key in range(7)))
-        return random_id
-###
-
     def set_default(self):
-        if 'apiserverProfile' not in self.body['properties']:
-            api_profile = dict(visibility="Public")
-            self.body['properties']['apiserverProfile'] = api_profile
-        if 'ingressProfiles' not in self.body['properties']:
-            ingress_profile = dict(visibility="Public", name="default")
-            self.body['properties']['ingressProfiles'] = [ingress_profile]
-        else:
-            # hard code the ingress profile name as default, so user don't need to specify it
-            for profile in self.body['properties']['ingressProfiles']:
-                profile['name'] = "default"
-        if 'name' not in self.body['properties']['workerProfiles'][0]:
-            self.body['properties']['workerProfiles'][0]['name'] = 'worker'
-        if 'vmSize' not in self.body['properties']['workerProfiles'][0]:
-            self.body['properties']['workerProfiles'][0]['vmSize'] = "Standard_D4s_v3"
-        if 'diskSizeGB' not in self.body['properties']['workerProfiles'][0]:
-            self.body['properties']['workerProfiles'][0]['diskSizeGB'] = 128
-        if 'vmSize' not in self.body['properties']['masterProfile']:
-            self.body['properties']['masterProfile']['vmSize'] = "Standard_D8s_v3"
-        if 'pullSecret' not in self.body['properties']['clusterProfile']:
-            self.body['properties']['clusterProfile']['pullSecret'] = ''
-        # if domain is not set in cluster profile or it is set to an empty string or null value then generate a random domain
-        self.random_id = self.random_id()
-        if 'domain' not in self.body['properties']['clusterProfile'] or not self.body['properties']['clusterProfile']['domain']:
-            self.body['properties']['clusterProfile']['domain'] = self.random_id
-        if 'resourceGroupId' not in self.body['properties']['clusterProfile'] or not self.body['properties']['clusterProfile']['resourceGroupId']:
-            resourcegroup_id = "/subscriptions/" + self.subscription_id + "/resourceGroups/" + self.name + "-" + self.random_id
-            self.body['properties']['clusterProfile']['resourceGroupId'] = resourcegroup_id
+        self.random_id = set_create_defaults(self.body, self.subscription_id, self.name)
 
 
 def main():
@@ -0,0 +1,310 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+---
+module: azure_rm_openshiftmanagedcluster_fleet
+version_added: '1.1.0'
+short_description: Create many Azure Red Hat OpenShift Managed Clusters with bounded concurrency
+description:
+    - Create a list of clusters, keeping at most I(max_workers) creations in flight.
+    - A new creation starts as soon as any other one finishes, so a slow cluster does not hold back the others.
+    - Clusters which already exist are left untouched.
+options:
+    clusters:
+        description:
+            - The clusters to create.
+            - Each cluster takes the options of M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster)
+              describing it, e.g. I(cluster_profile), I(network_profile), I(master_profile) or I(worker_profiles).
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            resource_group:
+                description:
+                    - The name of the resource group.
+                required: true
+                type: str
+            name:
+                description:
+                    - Resource name.
+                required: true
+                type: str
+            location:
+                description:
+                    - Resource location.
+                required: true
+                type: str
+            tags:
+                description:
+                    - Resource tags.
+                type: dict
+    max_workers:
+        description:
+            - Maximum number of cluster creations in flight.
+        type: int
+        default: 4
+    rp_mode:
+        description:
+            - Use production or development RP.
+        type: str
+        choices:
+            - production
+            - development
+        default: production
+    api_version:
+        description:
+            - Resource provider API version.
+        type: str
+        default: '2023-11-22'
+extends_documentation_fragment:
+    - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_polling
+author:
+    - Red Hat
+'''
+
+EXAMPLES = '''
+- name: Create clusters, four at a time
+  azure_rm_openshiftmanagedcluster_fleet:
+    max_workers: 4
+    clusters:
+      - resource_group: myResourceGroup
+        name: myCluster
+        location: eastus
+        cluster_profile:
+          version: 4.15.35
+        service_principal_profile:
+          client_id: "{{ client_id }}"
+          client_secret: "{{ client_secret }}"
+        master_profile:
+          subnet_id: "/subscriptions/xx-xx-xx-xx-xx/resourceGroups/myResourceGroup/providers/Microsoft.Network/virtualNetworks/myVnet/subnets/master"
+        worker_profiles:
+          - name: worker
+            subnet_id: "/subscriptions/xx-xx-xx-xx-xx/resourceGroups/myResourceGroup/providers/Microsoft.Network/virtualNetworks/myVnet/subnets/worker"
+  register: fleet
+'''
+
+RETURN = '''
+clusters:
+    description:
+        - Outcome of each cluster, keyed by C(resource_group/name).
+    returned: always
+    type: dict
+    contains:
+        status:
+            description:
+                - Terminal status of the creation, or C(Exists) if the cluster was already there.
+            type: str
+            sample: Succeeded
+        id:
+            description:
+                - Resource id of the cluster.
+            type: str
+        error:
+            description:
+                - Error reported by the resource provider, or raised while creating the cluster.
+            type: raw
+        started:
+            description:
+                - When the creation started, as a UNIX timestamp.
+            type: float
+        finished:
+            description:
+                - When the creation finished, as a UNIX timestamp.
+            type: float
+        queued:
+            description:
+                - Seconds the cluster waited for a free slot.
+            type: float
+        elapsed:
+            description:
+                - Seconds between the start and the end of the creation.
+            type: float
+        attempts:
+            description:
+                - Number of times the status of the creation was polled.
+            type: int
+elapsed:
+    description:
+        - Seconds it took to create all the clusters.
+    returned: always
+    type: float
+'''
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_body import (
+    build_body, cluster_arg_spec, set_create_defaults, validate_create_body
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import (
+    SUCCEEDED, TERMINAL_STATUSES, operation_from_response, response_json
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import (
+    MAX_POLLING_ERRORS, Poller, poll_operation, polling_arg_spec
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+
+EXISTS = 'Exists'
+
+
+class AzureRMOpenShiftManagedClustersFleet(AzureRMModuleBaseExt):
+    def __init__(self):
+        cluster_options = dict(
+            resource_group=dict(
+                type='str',
+                required=True
+            ),
+            name=dict(
+                type='str',
+                required=True
+            ),
+            location=dict(
+                type='str',
+                required=True
+            ),
+            tags=dict(
+                type='dict'
+            ),
+            **cluster_arg_spec()
+        )
+        self.module_arg_spec = dict(
+            clusters=dict(
+                type='list',
+                elements='dict',
+                required=True,
+                options=cluster_options
+            ),
+            max_workers=dict(
+                type='int',
+                default=4
+            ),
+            rp_mode=dict(
+                type='str',
+                choices=['production', 'development'],
+                default='production'
+            ),
+            api_version=dict(
+                type='str',
+                default='2023-11-22'
+            ),
+            polling=polling_arg_spec()
+        )
+
+        self.clusters = None
+        self.max_workers = 4
+        self.rp_mode = 'production'
+        self.api_version = None
+        self.polling = None
+
+        self.results = dict(changed=False)
+        self.mgmt_client = None
+        self.status_code = [200, 201, 202]
+
+        self.query_parameters = {}
+        self.header_parameters = {}
+        self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+
+        super(AzureRMOpenShiftManagedClustersFleet, self).__init__(self.module_arg_spec, supports_check_mode=True, supports_tags=False)
+
+    def exec_module(self, **kwargs):
+
+        for key in self.module_arg_spec:
+            setattr(self, key, kwargs[key])
+
+        self.query_parameters['api-version'] = self.api_version
+        self.mgmt_client = get_rest_client(self, self.rp_mode)
+
+        started = time.time()
+        statuses = {}
+        # The pool is the window of in-flight creations: a worker picks the next
+        # cluster as soon as its previous one has reached a terminal status
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            futures = dict((executor.submit(self.create, spec, started), spec) for spec in self.clusters)
+            for future in as_completed(futures):
+                spec = futures[future]
+                status = future.result()
+                statuses['{0}/{1}'.format(spec['resource_group'], spec['name'])] = status
+                self.log('OpenShiftManagedCluster {0} finished with status {1}'.format(spec['name'], status['status']))
+
+        self.results['clusters'] = statuses
+        self.results['elapsed'] = time.time() - started
+        self.results['changed'] = any(s['status'] != EXISTS for s in statuses.values())
+        failed = sorted(k for k, s in statuses.items() if s['status'] not in (SUCCEEDED, EXISTS))
+        if failed:
+            self.fail('Failed to create the OpenShiftManagedCluster instances {0}'.format(', '.join(failed)), **self.results)
+        return self.results
+
+    def cluster_url(self, resource_group, name):
+        return ('/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.RedHatOpenShift/openShiftClusters/{2}'
+                .format(self.subscription_id, resource_group, name))
+
+    def cluster_body(self, spec):
+        body = build_body(spec)
+        body['location'] = spec['location']
+        if spec.get('tags'):
+            body['tags'] = spec['tags']
+        validate_create_body(body)
+        set_create_defaults(body, self.subscription_id, spec['name'])
+        return body
+
+    def create(self, spec, submitted):
+        """Create one cluster and wait for it. Runs on a worker thread, so errors are returned, not raised."""
+        url = self.cluster_url(spec['resource_group'], spec['name'])
+        status = dict(started=time.time())
+        status['queued'] = status['started'] - submitted
+        try:
+            response = self.query(url, 'GET', None, [200, 404])
+            if response.status_code == 200:
+                status['status'] = EXISTS
+                status['id'] = response_json(response).get('id')
+            elif self.check_mode:
+                self.cluster_body(spec)
+                status['status'] = SUCCEEDED
+            else:
+                response = self.query(url, 'PUT', self.cluster_body(spec), self.status_code)
+                operation = operation_from_response(response, url, 'PUT', self.api_version, self.rp_mode)
+                poller = Poller.from_params(self.polling, max_errors=MAX_POLLING_ERRORS)
+                status['status'], progress = poller.poll(lambda: self.check(operation), response)
+                status['attempts'] = poller.attempts
+                status['id'] = response_json(response).get('id')
+                if progress.get('error'):
+                    status['error'] = progress['error']
+        except Exception as exc:
+            status['status'] = 'Error'
+            status['error'] = str(exc)
+        status['finished'] = time.time()
+        status['elapsed'] = status['finished'] - status['started']
+        return status
+
+    def check(self, operation):
+        status, progress, response, resource = poll_operation(self.mgmt_client, operation, dict(self.header_parameters))
+        return status in TERMINAL_STATUSES, (status, progress), response
+
+    def query(self, url, method, body, status_code):
+        # A polling timeout of 0 hands back the initial response untouched, headers included.
+        # The client adds per-request headers to the dict it is given, which the workers must not share
+        return self.mgmt_client.query(url,
+                                      method,
+                                      self.query_parameters,
+                                      dict(self.header_parameters),
+                                      body,
+                                      status_code,
+                                      0,
+                                      30)
+
+
+def main():
+    AzureRMOpenShiftManagedClustersFleet()
+
+
+if __name__ == '__main__':
+    main()
@@ -27,8 +27,51 @@ options:
             - Resource name.
         required: false
         type: str
+    clusters:
+        description:
+            - List of clusters to get in a single invocation, fetched concurrently.
+            - Takes precedence over I(resource_group) and I(name).
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            resource_group:
+                description:
+                    - The name of the resource group.
+                required: true
+                type: str
+            name:
+                description:
+                    - Resource name.
+                required: true
+                type: str
+    max_workers:
+        description:
+            - Maximum number of concurrent requests when I(clusters) is set.
+        type: int
+        default: 8
+    max_items:
+        description:
+            - Stop listing after this many clusters. All pages are followed by default.
+        type: int
+    filter:
+        description:
+            - OData C($filter) expression sent with list requests, where the resource provider supports it.
+        type: str
+    top:
+        description:
+            - Page size hint sent as C($top) with list requests, where the resource provider supports it.
+        type: int
+    fields:
+        description:
+            - Dotted paths of the attributes to return for each cluster, e.g. C(properties.provisioningState).
+            - Paths crossing a list, such as C(properties.workerProfiles.count), apply to every element.
+            - All attributes are returned by default.
+        type: list
+        elements: str
 extends_documentation_fragment:
     - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_cache
 author:
     - Paul Czarkowski (@paulczar)
 '''
@@ -39,10 +82,30 @@ EXAMPLES = '''
 - name: List all Azure Red Hat OpenShift Managed Clusters for a given resource group
   azure_rm_openshiftmanagedcluster_info:
     resource_group: myResourceGroup
+- name: List at most 50 Azure Red Hat OpenShift Managed Clusters for a given subscription
+  azure_rm_openshiftmanagedcluster_info:
+    max_items: 50
+- name: List the version and state of every cluster in the subscription
+  azure_rm_openshiftmanagedcluster_info:
+    fields:
+      - id
+      - properties.provisioningState
+      - properties.clusterProfile.version
 - name: Get Azure Red Hat OpenShift Managed Clusters
   azure_rm_openshiftmanagedcluster_info:
     resource_group: myResourceGroup
     name: myAzureFirewall
+- name: Get several Azure Red Hat OpenShift Managed Clusters at once
+  azure_rm_openshiftmanagedcluster_info:
+    clusters:
+      - resource_group: myResourceGroup
+        name: myCluster
+      - resource_group: myOtherResourceGroup
+        name: myOtherCluster
+  register: sweep
+- name: Show provisioning states
+  debug:
+    msg: "{{ sweep.clusters | dict2items | map(attribute='value.properties.provisioningState') | list }}"
 '''
 
 RETURN = '''
@@ -248,9 +311,32 @@ properties:
                     sample: Public
 '''
 
-import json
+from concurrent.futures import ThreadPoolExecutor
 from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
-from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import cache_arg_spec, cache_from_params, conditional_get
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_paging import iter_items
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+
+
+def select_fields(item, fields):
+    result = {}
+    for field in fields:
+        copy_path(item, result, field.split('.'))
+    return result
+
+
+def copy_path(source, target, keys):
+    if not isinstance(source, dict) or keys[0] not in source:
+        return
+    value = source[keys[0]]
+    if len(keys) == 1:
+        target[keys[0]] = value
+    elif isinstance(value, dict):
+        copy_path(value, target.setdefault(keys[0], {}), keys[1:])
+    elif isinstance(value, list):
+        elements = target.setdefault(keys[0], [{} for x in value])
+        for source_element, target_element in zip(value, elements):
+            copy_path(source_element, target_element, keys[1:])
 
 
 class Actions:
@@ -266,6 +352,38 @@ class AzureRMOpenShiftManagedClustersInfo(AzureRMModuleBaseExt):
             name=dict(
                 type='str'
             ),
+            clusters=dict(
+                type='list',
+                elements='dict',
+                options=dict(
+                    resource_group=dict(
+                        type='str',
+                        required=True
+                    ),
+                    name=dict(
+                        type='str',
+                        required=True
+                    )
+                )
+            ),
+            max_workers=dict(
+                type='int',
+                default=8
+            ),
+            max_items=dict(
+                type='int'
+            ),
+            filter=dict(
+                type='str'
+            ),
+            top=dict(
+                type='int'
+            ),
+            fields=dict(
+                type='list',
+                elements='str'
+            ),
+            cache=cache_arg_spec(),
             rp_mode=dict(
                 type='str',
                 choices=['production', 'development']
@@ -278,6 +396,14 @@ class AzureRMOpenShiftManagedClustersInfo(AzureRMModuleBaseExt):
 
         self.resource_group = None
         self.name = None
+        self.clusters = None
+        self.max_workers = 8
+        self.max_items = None
+        self.filter = None
+        self.top = None
+        self.fields = None
+        self.cache = None
+        self.response_cache = None
 
         self.results = dict(changed=False)
         self.mgmt_client = None
@@ -305,11 +431,15 @@ class AzureRMOpenShiftManagedClustersInfo(AzureRMModuleBaseExt):
             else:
                 setattr(self, key, kwargs[key])
 
-        self.mgmt_client = self.get_mgmt_svc_client(GenericRestClient,
-                                                    base_url=self._cloud_environment.endpoints.resource_manager)
+        self.mgmt_client = get_rest_client(self, self.rp_mode)
+        # Cluster documents are revalidated with their ETag on every read, the TTL only bounds disk usage
+        self.response_cache = cache_from_params(self.cache, 'responses', ttl=3600)
         self.query_parameters['api-version'] = self.api_version
 
-        if (self.resource_group is not None and self.name is not None):
+        if self.clusters:
+            self.results['verb'] = "batch"
+            self.results['clusters'] = self.batch()
+        elif (self.resource_group is not None and self.name is not None):
             self.results['verb'] = "get"
             self.results['clusters'] = self.get()
         elif (self.resource_group is not None):
@@ -320,36 +450,42 @@ class AzureRMOpenShiftManagedClustersInfo(AzureRMModuleBaseExt):
             self.results['clusters'] = self.listall()
         return self.results
 
+    def batch(self):
+        urls = [self.cluster_url(c['resource_group'], c['name']) for c in self.clusters]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(urls)))) as executor:
+            items = executor.map(self.get_url, urls)
+            return dict(('/' + url, item) for url, item in zip(urls, items))
+
+    def cluster_url(self, resource_group, name):
+        return path.join('subscriptions',
+                         self.subscription_id,
+                         'resourceGroups',
+                         resource_group,
+                         'providers',
+                         'Microsoft.RedHatOpenShift',
+                         'openShiftClusters',
+                         name)
+
     def get(self):
+        # prepare url
+        self.url = self.cluster_url(self.resource_group, self.name)
+        return self.get_url(self.url)
+
+    def get_url(self, url):
         response = None
         results = {}
-        # prepare url
-        self.url = path.join('subscriptions',
-                        self.subscription_id,
-                        'resourceGroups',
-                        self.resource_group,
-                        'providers',
-                        'Microsoft.RedHatOpenShift',
-                        'openShiftClusters',
-                        self.name)
-        results["resource_id"] = self.url
+        results["resource_id"] = url
 
         try:
-            if self.rp_mode == "development":
-                self.mgmt_client._client._base_url = "https://localhost:8443/"
-                self.mgmt_client._client._pipeline._transport.connection_config.verify = False
-            response = self.mgmt_client.query(self.url,
-                                              'GET',
-                                              self.query_parameters,
-                                              self.header_parameters,
-                                              None,
-                                              self.status_code,
-                                              600,
-                                              30)
-            results = json.loads(response.body())
+            status, results, response = conditional_get(self.mgmt_client,
+                                                        self.response_cache,
+                                                        url,
+                                                        self.query_parameters,
+                                                        self.header_parameters,
+                                                        self.status_code)
             results["rp_mode"] = self.rp_mode
             results["api_version"] = self.api_version
-            results["resource_id"] = self.url
+            results["resource_id"] = url
             self.log('Response : {0}'.format(response))
         except Exception as e:
             self.log('Could not get info for @(Model.ModuleOperationNameUpper).')
@@ -358,8 +494,6 @@ class AzureRMOpenShiftManagedClustersInfo(AzureRMModuleBaseExt):
         return self.format_item(results)
 
     def list(self):
-        response = None
-        results = {}
         # prepare url
         self.url = path.join('subscriptions',
                         self.subscription_id,
@@ -368,61 +502,41 @@ class AzureRMOpenShiftManagedClustersInfo(AzureRMModuleBaseExt):
                         'providers',
                         'Microsoft.RedHatOpenShift',
                         'openShiftClusters')
-
-        try:
-            if self.rp_mode == "development":
-                self.mgmt_client._client._base_url = "https://localhost:8443/"
-                self.mgmt_client._client._pipeline._transport.connection_config.verify = False
-            response = self.mgmt_client.query(self.url,
-                                              'GET',
-                                              self.query_parameters,
-                                              self.header_parameters,
-                                              None,
-                                              self.status_code,
-                                              600,
-                                              30)
-            results = json.loads(response.body())
-            results["rp_mode"] = self.rp_mode
-            results["api_version"] = self.api_version
-            results["resource_id"] = self.url
-        except Exception as e:
-            self.log('Could not get info for @(Model.ModuleOperationNameUpper).')
-
-        return [self.format_item(x) for x in results['value']] if results.get('value') else []
+        return self.list_items()
 
     def listall(self):
-        response = None
-        results = {}
         # prepare url
         self.url = path.join('subscriptions',
                         self.subscription_id,
                         'providers',
                         'Microsoft.RedHatOpenShift',
                         'openShiftClusters')
-        self.url = self.url.replace('{{ subscription_id }}', self.subscription_id)
+        return self.list_items()
+
+    def list_items(self):
+        query_parameters = dict(self.query_parameters)
+        if self.filter:
+            query_parameters['$filter'] = self.filter
+        if self.top:
+            query_parameters['$top'] = self.top
 
+        items = []
         try:
-            if self.rp_mode == "development":
-                self.mgmt_client._client._base_url = "https://localhost:8443/"
-                self.mgmt_client._client._pipeline._transport.connection_config.verify = False
-            response = self.mgmt_client.query(self.url,
-                                              'GET',
-                                              self.query_parameters,
-                                              self.header_parameters,
-                                              None,
-                                              self.status_code,
-                                              600,
-                                              30)
-            results = json.loads(response.body())
-            results["rp_mode"] = self.rp_mode
-            results["api_version"] = self.api_version
-            results["resource_id"] = self.url
+            for item in iter_items(self.mgmt_client,
+                                   self.url,
+                                   query_parameters,
+                                   self.header_parameters,
+                                   self.status_code,
+                                   self.max_items):
+                items.append(self.format_item(item))
         except Exception as e:
-            self.log('Could not get info for @(Model.ModuleOperationNameUpper).')
-
-        return results
+            # a partial list would look like clusters were deleted
+            self.fail('Could not list clusters at {0} after {1} clusters: {2}'.format(self.url, len(items), str(e)))
+        return items
 
     def format_item(self, item):
+        if self.fields:
+            return select_fields(item, self.fields)
         return item
         # d = {
         #     'id': item['id'],
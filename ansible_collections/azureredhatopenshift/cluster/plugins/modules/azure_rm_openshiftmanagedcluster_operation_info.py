@@ -0,0 +1,203 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+---
+module: azure_rm_openshiftmanagedcluster_operation_info
+version_added: '1.1.0'
+short_description: Get the status of a long running Azure Red Hat OpenShift Managed Cluster operation
+description:
+    - Poll an operation started by M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster) with I(wait=false).
+options:
+    token:
+        description:
+            - The I(operation.token) returned by M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster).
+        required: true
+        type: str
+    wait:
+        description:
+            - Whether to keep polling, according to I(polling), until the operation reaches a terminal status.
+        type: bool
+        default: false
+extends_documentation_fragment:
+    - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_polling
+author:
+    - Red Hat
+'''
+
+EXAMPLES = '''
+- name: Start creating clusters without waiting for them
+  azure_rm_openshiftmanagedcluster:
+    resource_group: "{{ item.resource_group }}"
+    name: "{{ item.name }}"
+    location: eastus
+    wait: false
+    master_profile: "{{ item.master_profile }}"
+    worker_profiles: "{{ item.worker_profiles }}"
+  loop: "{{ clusters }}"
+  register: create_ops
+
+- name: Wait for all creations to finish
+  azure_rm_openshiftmanagedcluster_operation_info:
+    token: "{{ item.operation.token }}"
+  loop: "{{ create_ops.results }}"
+  register: op
+  until: op.done
+  retries: 90
+  delay: 60
+
+- name: Block until a single creation has finished
+  azure_rm_openshiftmanagedcluster_operation_info:
+    token: "{{ create_op.operation.token }}"
+    wait: true
+    polling:
+      initial_delay: 30
+      max_delay: 300
+'''
+
+RETURN = '''
+status:
+    description:
+        - Status of the operation.
+    returned: always
+    type: str
+    sample: InProgress
+done:
+    description:
+        - Whether the operation reached a terminal status.
+    returned: always
+    type: bool
+    sample: false
+error:
+    description:
+        - Error reported by the resource provider for a failed operation.
+    returned: when the operation failed
+    type: dict
+progress:
+    description:
+        - Progress of the operation as reported by its status monitor.
+        - Besides I(status), holds I(percent_complete), I(start_time), I(end_time) and I(error) when the resource provider reports them.
+    returned: always
+    type: dict
+    sample: {"status": "InProgress", "percent_complete": 40.0, "start_time": "2024-09-01T10:00:00Z"}
+resource:
+    description:
+        - The cluster document once a create or update operation has succeeded.
+    returned: when the operation succeeded and was a create or update
+    type: dict
+'''
+
+from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import (
+    SUCCEEDED, TERMINAL_STATUSES, decode_token, response_json
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import (
+    MAX_POLLING_ERRORS, Poller, PollingTimeout, poll_operation, polling_arg_spec
+)
+
+
+class AzureRMOpenShiftManagedClustersOperationInfo(AzureRMModuleBaseExt):
+    def __init__(self):
+        self.module_arg_spec = dict(
+            token=dict(
+                type='str', required=True, no_log=False
+            ),
+            wait=dict(
+                type='bool', default=False
+            ),
+            polling=polling_arg_spec()
+        )
+
+        self.token = None
+        self.wait = False
+        self.polling = None
+        self.operation = None
+
+        self.results = dict(changed=False)
+        self.mgmt_client = None
+
+        self.header_parameters = {}
+        self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+
+        super(AzureRMOpenShiftManagedClustersOperationInfo, self).__init__(self.module_arg_spec, supports_check_mode=True, supports_tags=False)
+
+    def exec_module(self, **kwargs):
+
+        for key in self.module_arg_spec:
+            setattr(self, key, kwargs[key])
+
+        try:
+            self.operation = decode_token(self.token)
+        except ValueError as exc:
+            self.fail(str(exc))
+
+        self.mgmt_client = get_rest_client(self, self.operation.get('rp_mode'))
+
+        if self.wait:
+            poller = Poller.from_params(self.polling, max_errors=MAX_POLLING_ERRORS)
+            try:
+                status, progress = poller.poll(self.check_status)
+            except PollingTimeout as exc:
+                self.fail('Error waiting for operation: {0}'.format(str(exc)))
+            except Exception as exc:
+                self.fail('Error polling operation after {0} attempts: {1}'.format(poller.attempts, str(exc)))
+        else:
+            try:
+                status, progress = self.get_status()[:2]
+            except Exception as exc:
+                self.fail('Error polling operation: {0}'.format(str(exc)))
+        self.results['status'] = status
+        self.results['done'] = status in TERMINAL_STATUSES
+        self.results['progress'] = progress
+        if progress.get('error'):
+            self.results['error'] = progress['error']
+        if status == SUCCEEDED and self.operation.get('method') in ('PUT', 'PATCH'):
+            self.results['resource'] = self.get_resource()
+        return self.results
+
+    def check_status(self):
+        status, progress, response = self.get_status()
+        return status in TERMINAL_STATUSES, (status, progress), response
+
+    def get_status(self):
+        # Without polling headers, e.g. when the resource provider finished synchronously,
+        # the status is derived from the resource itself. Errors are raised, so the poller can retry them
+        status, progress, response, resource = poll_operation(self.mgmt_client, self.operation, self.header_parameters)
+        return status, progress, response
+
+    def get_resource(self):
+        """Return the cluster, or {} once it does not exist."""
+        try:
+            response = self.query(self.operation['resource_url'], {'api-version': self.operation['api_version']}, [200, 404])
+        except Exception as exc:
+            self.fail('Could not get the OpenShiftManagedCluster instance: {0}'.format(str(exc)))
+        if response.status_code == 404:
+            return {}
+        return response_json(response)
+
+    def query(self, url, query_parameters, status_code):
+        return self.mgmt_client.query(url,
+                                      'GET',
+                                      query_parameters,
+                                      self.header_parameters,
+                                      None,
+                                      status_code,
+                                      0,
+                                      30)
+
+
+def main():
+    AzureRMOpenShiftManagedClustersOperationInfo()
+
+
+if __name__ == '__main__':
+    main()
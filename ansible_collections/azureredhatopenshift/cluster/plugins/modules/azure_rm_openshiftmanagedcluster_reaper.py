@@ -0,0 +1,252 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+---
+module: azure_rm_openshiftmanagedcluster_reaper
+version_added: '1.1.0'
+short_description: Collect the Azure Red Hat OpenShift Managed Cluster deletions started without waiting
+description:
+    - Poll, concurrently, the deletions of the current subscription recorded in the ledger by
+      M(azureredhatopenshift.cluster.azure_rm_openshiftmanagedcluster) with I(state=absent) and I(wait=false).
+    - Finished deletions are dropped from the ledger, failed ones are sent again up to I(max_attempts) times.
+    - A deletion still failing after I(max_attempts) DELETE requests is reported as failed once, then dropped from the ledger.
+    - Deletions which do not finish within the I(polling) timeout stay in the ledger, without using up an attempt.
+options:
+    ledger:
+        description:
+            - File recording the pending deletions.
+            - Defaults to the C(ARO_LEDGER_FILE) environment variable, else C(ledger.json) in the cache directory.
+        type: path
+    wait:
+        description:
+            - Whether to wait for every pending deletion to finish, polling according to I(polling).
+            - Use C(false) to check each deletion once, leaving those in progress in the ledger.
+        type: bool
+        default: true
+    max_attempts:
+        description:
+            - Number of DELETE requests sent for a cluster before its deletion is reported as failed and given up.
+        type: int
+        default: 3
+    max_workers:
+        description:
+            - Maximum number of deletions polled at once.
+        type: int
+        default: 8
+extends_documentation_fragment:
+    - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_polling
+author:
+    - Red Hat
+'''
+
+EXAMPLES = '''
+- name: Collect the clusters deleted by earlier jobs
+  azure_rm_openshiftmanagedcluster_reaper:
+  register: reaped
+
+- name: Check on them without blocking
+  azure_rm_openshiftmanagedcluster_reaper:
+    wait: false
+'''
+
+RETURN = '''
+deletions:
+    description:
+        - Outcome of each pending deletion, keyed by resource id.
+    returned: always
+    type: dict
+    contains:
+        status:
+            description:
+                - Status of the deletion, C(InProgress) if it has not finished yet.
+                - C(Absent) if the cluster was already gone when its deletion was sent again.
+            type: str
+            sample: Succeeded
+        attempts:
+            description:
+                - Number of DELETE requests sent for the cluster.
+            type: int
+        error:
+            description:
+                - Last error reported by the resource provider, or raised while polling the deletion.
+            type: raw
+        elapsed:
+            description:
+                - Seconds since the deletion was first recorded in the ledger.
+            type: float
+pending:
+    description:
+        - Number of deletions of the subscription left in the ledger.
+    returned: always
+    type: int
+'''
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_ledger import Ledger, ledger_path
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import (
+    CANCELED, FAILED, SUCCEEDED, TERMINAL_STATUSES
+)
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import Poller, PollingTimeout, polling_arg_spec
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_teardown import (
+    ABSENT, IN_PROGRESS, check_deletion, start_deletion
+)
+
+
+class AzureRMOpenShiftManagedClustersReaper(AzureRMModuleBaseExt):
+    def __init__(self):
+        self.module_arg_spec = dict(
+            ledger=dict(
+                type='path'
+            ),
+            wait=dict(
+                type='bool',
+                default=True
+            ),
+            max_attempts=dict(
+                type='int',
+                default=3
+            ),
+            max_workers=dict(
+                type='int',
+                default=8
+            ),
+            polling=polling_arg_spec()
+        )
+
+        self.ledger = None
+        self.wait = True
+        self.max_attempts = 3
+        self.max_workers = 8
+        self.polling = None
+
+        self.results = dict(changed=False)
+        self.clients = {}
+        self.client_lock = threading.Lock()
+
+        self.header_parameters = {}
+        self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+
+        super(AzureRMOpenShiftManagedClustersReaper, self).__init__(self.module_arg_spec, supports_check_mode=True, supports_tags=False)
+
+    def exec_module(self, **kwargs):
+
+        for key in self.module_arg_spec:
+            setattr(self, key, kwargs[key])
+
+        ledger = Ledger(ledger_path(self.ledger))
+        entries = ledger.entries(self.subscription_id)
+        self.log('Reaping {0} pending deletions from {1}'.format(len(entries), ledger.path))
+
+        if entries and not self.check_mode:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+                futures = dict((key, executor.submit(self.reap, ledger, key, entry)) for key, entry in entries.items())
+            reaped = dict((key, future.result()) for key, future in futures.items())
+        else:
+            reaped = dict((key, dict(status=IN_PROGRESS,
+                                     attempts=entry['attempts'],
+                                     error=entry.get('error'),
+                                     elapsed=time.time() - entry['first_recorded']))
+                          for key, entry in entries.items())
+
+        deletions = dict((entries[key]['operation']['resource_url'], d) for key, d in reaped.items())
+        self.results['deletions'] = deletions
+        self.results['pending'] = len(ledger.entries(self.subscription_id))
+        # finished deletions left the ledger, retried ones were sent again
+        self.results['changed'] = any(d['status'] != IN_PROGRESS or d['attempts'] > entries[key]['attempts']
+                                      for key, d in reaped.items())
+        failed = sorted(url for url, d in deletions.items() if d['status'] in TERMINAL_STATUSES and d['status'] != SUCCEEDED)
+        if failed:
+            self.fail('Failed to delete {0}'.format(', '.join(failed)), **self.results)
+        return self.results
+
+    def client(self, rp_mode):
+        # clients are shared by the workers, build each one once
+        rp_mode = rp_mode or 'production'
+        with self.client_lock:
+            if rp_mode not in self.clients:
+                self.clients[rp_mode] = get_rest_client(self, rp_mode)
+            return self.clients[rp_mode]
+
+    def reap(self, ledger, key, entry):
+        """Poll one deletion, sending it again if it failed. Runs on a worker thread, so errors are returned, not raised."""
+        operation = entry['operation']
+        attempts = entry['attempts']
+        error = entry.get('error')
+        client = None
+        status = FAILED
+        try:
+            client = self.client(operation.get('rp_mode'))
+            status, error = self.poll(client, operation)
+        except Exception as exc:
+            # e.g. the status monitor of an old operation expired, send the DELETE again
+            status, error = FAILED, str(exc)
+        while status in (FAILED, CANCELED) and client is not None and attempts < self.max_attempts:
+            attempts += 1
+            self.log('Deleting {0} again, attempt {1}: {2}'.format(operation['resource_url'], attempts, error))
+            try:
+                status, started, response = start_deletion(client,
+                                                           operation['resource_url'],
+                                                           operation['api_version'],
+                                                           operation.get('rp_mode'),
+                                                           self.header_parameters)
+                if started is not None:
+                    operation = started
+                    entry = ledger.record(operation, entry['subscription_id'], attempts, error, entry['first_recorded'])
+                    status, error = self.poll(client, operation, response)
+            except Exception as exc:
+                status, error = FAILED, str(exc)
+
+        if status in (SUCCEEDED, ABSENT):
+            error = None
+            ledger.remove(key, entry['recorded'])
+        elif status in TERMINAL_STATUSES and client is not None:
+            # every attempt failed, report it this once rather than on every run
+            self.log('Giving up deleting {0} after {1} attempts: {2}'.format(operation['resource_url'], attempts, error))
+            ledger.remove(key, entry['recorded'])
+        elif status in TERMINAL_STATUSES:
+            # no client to send the deletion with, try again on the next run
+            ledger.record(operation, entry['subscription_id'], attempts, error, entry['first_recorded'])
+        return dict(status=status, attempts=attempts, error=error, elapsed=time.time() - entry['first_recorded'])
+
+    def poll(self, client, operation, initial_response=None):
+        """Return the (status, error) of a deletion, once it is terminal unless wait is false.
+
+        Statuses of running deletions, e.g. Deleting or Accepted, are reported as InProgress.
+        """
+        def check():
+            status, error, response = check_deletion(client, operation, self.header_parameters)
+            if status not in TERMINAL_STATUSES:
+                status = IN_PROGRESS
+            return status in TERMINAL_STATUSES, (status, error), response
+
+        if not self.wait:
+            done, result, response = check()
+            return result
+
+        poller = Poller.from_params(self.polling)
+        try:
+            return poller.poll(check, initial_response)
+        except PollingTimeout as exc:
+            # still running, leave it to the next run
+            return IN_PROGRESS, str(exc)
+
+
+def main():
+    AzureRMOpenShiftManagedClustersReaper()
+
+
+if __name__ == '__main__':
+    main()
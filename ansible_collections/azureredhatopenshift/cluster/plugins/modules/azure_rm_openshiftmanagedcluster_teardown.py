@@ -0,0 +1,280 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+---
+module: azure_rm_openshiftmanagedcluster_teardown
+version_added: '1.1.0'
+short_description: Delete an Azure Red Hat OpenShift Managed Cluster, its identities and its resource group
+description:
+    - Delete a cluster, the managed identities it used and the resource group it was created in, as concurrent async operations.
+    - The identities and the resource group are deleted as soon as the cluster is gone, in parallel.
+    - Identities in the resource group being deleted are left to the deletion of the resource group.
+    - The service principal of a cluster is not an Azure resource and is not deleted.
+options:
+    resource_group:
+        description:
+            - The name of the resource group of the cluster.
+        required: true
+        type: str
+    name:
+        description:
+            - Name of the cluster.
+        required: true
+        type: str
+    delete_identities:
+        description:
+            - Delete the cluster MSI and the platform workload identities of the cluster.
+        type: bool
+        default: true
+    identities:
+        description:
+            - Resource ids of further managed identities to delete once the cluster is gone.
+            - Use it when the cluster may already be gone and its identities can not be looked up anymore.
+        type: list
+        elements: str
+        default: []
+    delete_resource_group:
+        description:
+            - Delete I(resource_group) once the cluster is gone.
+        type: bool
+        default: true
+    max_workers:
+        description:
+            - Maximum number of deletions in flight.
+        type: int
+        default: 8
+    rp_mode:
+        description:
+            - Use production or development RP.
+            - Only the cluster is deleted through the development RP, identities and resource groups always through ARM.
+        type: str
+        choices:
+            - production
+            - development
+        default: production
+    api_version:
+        description:
+            - Resource provider API version.
+        type: str
+        default: '2023-11-22'
+extends_documentation_fragment:
+    - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_polling
+author:
+    - Red Hat
+'''
+
+EXAMPLES = '''
+- name: Delete a cluster with everything around it
+  azure_rm_openshiftmanagedcluster_teardown:
+    resource_group: myResourceGroup
+    name: myCluster
+  register: teardown
+
+- name: Delete a cluster and the identities it used, but keep its resource group
+  azure_rm_openshiftmanagedcluster_teardown:
+    resource_group: myResourceGroup
+    name: myCluster
+    delete_resource_group: false
+'''
+
+RETURN = '''
+cluster:
+    description:
+        - The cluster as it was before its deletion.
+    returned: when the cluster existed
+    type: dict
+deletions:
+    description:
+        - Outcome of each deletion, keyed by C(cluster), C(resource_group) or the lower cased resource id of an identity.
+    returned: always
+    type: dict
+    contains:
+        status:
+            description:
+                - Terminal status of the deletion.
+                - C(Absent) if the resource was already gone, C(Skipped) if it was not deleted because a deletion it depends on failed.
+            type: str
+            sample: Succeeded
+        url:
+            description:
+                - Resource id of the deleted resource.
+            type: str
+        error:
+            description:
+                - Error reported by the resource provider, or raised while deleting the resource.
+            type: raw
+        started:
+            description:
+                - When the deletion started, as a UNIX timestamp.
+            type: float
+        finished:
+            description:
+                - When the deletion finished, as a UNIX timestamp.
+            type: float
+        elapsed:
+            description:
+                - Seconds between the start and the end of the deletion.
+            type: float
+        attempts:
+            description:
+                - Number of times the status of the deletion was polled.
+            type: int
+elapsed:
+    description:
+        - Seconds it took to delete everything.
+    returned: always
+    type: float
+'''
+
+import time
+from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_operation import response_json
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_polling import polling_arg_spec
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_teardown import (
+    ABSENT, IDENTITY_API_VERSION, RESOURCE_GROUP_API_VERSION, SKIPPED, SUCCEEDED, Teardown,
+    cluster_identities, resource_group_of, resource_group_url
+)
+
+
+class AzureRMOpenShiftManagedClustersTeardown(AzureRMModuleBaseExt):
+    def __init__(self):
+        self.module_arg_spec = dict(
+            resource_group=dict(
+                type='str',
+                required=True
+            ),
+            name=dict(
+                type='str',
+                required=True
+            ),
+            delete_identities=dict(
+                type='bool',
+                default=True
+            ),
+            identities=dict(
+                type='list',
+                elements='str',
+                default=[]
+            ),
+            delete_resource_group=dict(
+                type='bool',
+                default=True
+            ),
+            max_workers=dict(
+                type='int',
+                default=8
+            ),
+            rp_mode=dict(
+                type='str',
+                choices=['production', 'development'],
+                default='production'
+            ),
+            api_version=dict(
+                type='str',
+                default='2023-11-22'
+            ),
+            polling=polling_arg_spec()
+        )
+
+        self.resource_group = None
+        self.name = None
+        self.delete_identities = True
+        self.identities = None
+        self.delete_resource_group = True
+        self.max_workers = 8
+        self.rp_mode = 'production'
+        self.api_version = None
+        self.polling = None
+
+        self.results = dict(changed=False)
+        self.mgmt_client = None
+        self.arm_client = None
+
+        self.header_parameters = {}
+        self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+
+        super(AzureRMOpenShiftManagedClustersTeardown, self).__init__(self.module_arg_spec, supports_check_mode=True, supports_tags=False)
+
+    def exec_module(self, **kwargs):
+
+        for key in self.module_arg_spec:
+            setattr(self, key, kwargs[key])
+
+        self.mgmt_client = get_rest_client(self, self.rp_mode)
+        # identities and resource groups are not served by a development RP
+        self.arm_client = self.mgmt_client if self.rp_mode == 'production' else get_rest_client(self, 'production')
+
+        url = ('/subscriptions/{0}/resourceGroups/{1}/providers/Microsoft.RedHatOpenShift/openShiftClusters/{2}'
+               .format(self.subscription_id, self.resource_group, self.name))
+        cluster = self.get_cluster(url)
+        if cluster is not None:
+            self.results['cluster'] = cluster
+
+        teardown = Teardown(self.header_parameters, self.polling, self.max_workers, self.check_mode)
+        deleted_cluster = teardown.add('cluster', self.mgmt_client, url, self.api_version, self.rp_mode)
+        for identity in self.identities_to_delete(cluster):
+            teardown.add(identity.strip('/').lower(), self.arm_client, identity, IDENTITY_API_VERSION,
+                         depends_on=[deleted_cluster])
+        if self.delete_resource_group:
+            teardown.add('resource_group', self.arm_client, resource_group_url(self.subscription_id, self.resource_group),
+                         RESOURCE_GROUP_API_VERSION, depends_on=[deleted_cluster])
+
+        started = time.time()
+        deletions = teardown.run()
+        for name, deletion in deletions.items():
+            self.log('Deletion of {0} finished with status {1}'.format(name, deletion['status']))
+
+        self.results['deletions'] = deletions
+        self.results['elapsed'] = time.time() - started
+        self.results['changed'] = any(d['status'] not in (ABSENT, SKIPPED) for d in deletions.values())
+        failed = sorted(k for k, d in deletions.items() if d['status'] not in (SUCCEEDED, ABSENT))
+        if failed:
+            self.fail('Failed to delete {0}'.format(', '.join(failed)), **self.results)
+        return self.results
+
+    def get_cluster(self, url):
+        try:
+            response = self.mgmt_client.query(url,
+                                              'GET',
+                                              {'api-version': self.api_version},
+                                              self.header_parameters,
+                                              None,
+                                              [200, 404],
+                                              0,
+                                              30)
+        except Exception as exc:
+            self.fail('Error getting the OpenShiftManagedCluster instance: {0}'.format(str(exc)))
+        if response.status_code == 404:
+            return None
+        return response_json(response)
+
+    def identities_to_delete(self, cluster):
+        """Identities to delete, without those the deletion of the resource group takes care of."""
+        ids = list(self.identities)
+        if self.delete_identities and cluster is not None:
+            ids += cluster_identities(cluster)
+        covered = (self.subscription_id.lower(), self.resource_group.lower()) if self.delete_resource_group else None
+        seen = set()
+        for identity in ids:
+            if identity.lower() in seen or resource_group_of(identity) == covered:
+                continue
+            seen.add(identity.lower())
+            yield identity
+
+
+def main():
+    AzureRMOpenShiftManagedClustersTeardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -15,24 +15,65 @@ version_added: '1.17.0'
 short_description: Get admin kubeconfig of Azure Red Hat OpenShift Managed Cluster
 description:
     - get kubeconfig of Azure Red Hat OpenShift Managed Cluster instance.
+    - The admin credentials are cached locally by default, in files only readable by their owner,
+      so the steps of a run share one request per cluster. Set I(cache.enabled=false) to opt out.
 options:
     resource_group:
         description:
             - The name of the resource group.
-        required: true
+            - Required with I(name).
         type: str
     name:
         description:
             - Resource name.
-        required: true
+            - Either I(name) or I(clusters) is required.
         type: str
+    clusters:
+        description:
+            - List of clusters whose admin kubeconfig to fetch concurrently in a single invocation.
+        type: list
+        elements: dict
+        suboptions:
+            resource_group:
+                description:
+                    - The name of the resource group.
+                required: true
+                type: str
+            name:
+                description:
+                    - Resource name.
+                required: true
+                type: str
+            path:
+                description:
+                    - Destination filepath of the kubeconfig file of this cluster. Defaults to I(path).
+                type: str
+    max_workers:
+        description:
+            - Maximum number of concurrent requests when I(clusters) is set.
+        type: int
+        default: 8
     path:
         description:
             - Destination filepath of kubeconfig file
+            - With I(clusters), a template where C({resource_group}) and C({name}) are replaced for each cluster.
+            - The file is replaced atomically. A hidden C(.<name>.digest) file next to it records what was written,
+              so that re-fetching an unchanged kubeconfig does not rewrite it.
         required: false
         type: str
+    renew_before:
+        description:
+            - A cached kubeconfig is reused until its client certificate expires in less than this many seconds.
+        type: int
+        default: 86400
+    refresh:
+        description:
+            - Ignore a cached kubeconfig and fetch the admin credentials from the resource provider.
+        type: bool
+        default: false
 extends_documentation_fragment:
     - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_cache
 author:
     - Maxim Babushkin (@maxbab)
 '''
@@ -59,23 +100,62 @@ EXAMPLES = '''
     name: myCluster
     resource_group: myResourceGroup
     path: ./files/
+
+- name: Fetch kubeconfig without caching the admin credentials
+  azure_rm_openshiftmanagedclusterkubeconfig_info:
+    name: myCluster
+    resource_group: myResourceGroup
+    path: ./files/mycluster_kubeconfig
+    cache:
+      enabled: false
+
+- name: Fetch the kubeconfigs of several clusters at once
+  azure_rm_openshiftmanagedclusterkubeconfig_info:
+    clusters:
+      - resource_group: myResourceGroup
+        name: myCluster
+      - resource_group: myOtherResourceGroup
+        name: myOtherCluster
+    path: "./files/{resource_group}/{name}.kubeconfig"
+  register: kubeconfigs
 '''
 
 RETURN = '''
 kubeconfig:
     description:
         - kubeconfig value
-    returned: always
+    returned: when I(name) is set
     type: str
+clusters:
+    description:
+        - Status per cluster, keyed by C(resource_group/name).
+        - Each status has I(changed), I(cached), and I(path) or I(kubeconfig), or I(failed) and I(msg).
+    returned: when I(clusters) is set
+    type: dict
+expires:
+    description:
+        - UNIX time at which the client certificate of the kubeconfig expires.
+    returned: when I(cache) is enabled and the certificate could be parsed
+    type: int
+cached:
+    description:
+        - Whether the kubeconfig was read from the local cache.
+    returned: when I(name) is set
+    type: bool
 '''
 
 import base64
-import filecmp
+import hashlib
 import json
 import os
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
-from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import cache_arg_spec, cache_from_params
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_kubeconfig import client_certificate_expiry
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
 
 
 class Actions:
@@ -86,19 +166,51 @@ class AzureRMOpenShiftManagedClustersKubeconfigInfo(AzureRMModuleBaseExt):
     def __init__(self):
         self.module_arg_spec = dict(
             resource_group=dict(
-                type='str', required=True
+                type='str'
             ),
             name=dict(
-                type='str', required=True
+                type='str'
+            ),
+            clusters=dict(
+                type='list',
+                elements='dict',
+                options=dict(
+                    resource_group=dict(
+                        type='str', required=True
+                    ),
+                    name=dict(
+                        type='str', required=True
+                    ),
+                    path=dict(
+                        type='str'
+                    )
+                )
+            ),
+            max_workers=dict(
+                type='int', default=8
             ),
             path=dict(
                 type='str', required=False
-            )
+            ),
+            renew_before=dict(
+                type='int', default=86400
+            ),
+            refresh=dict(
+                type='bool', default=False
+            ),
+            cache=cache_arg_spec()
         )
 
         self.resource_group = None
         self.name = None
         self.path = None
+        self.renew_before = 86400
+        self.refresh = False
+        self.cache = None
+        self.clusters = None
+        self.max_workers = 8
+        self.credentials_cache = None
+        self.client_lock = threading.Lock()
 
         self.results = dict(changed=False)
         self.mgmt_client = None
@@ -112,50 +224,114 @@ class AzureRMOpenShiftManagedClustersKubeconfigInfo(AzureRMModuleBaseExt):
         self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
 
         self.mgmt_client = None
-        super(AzureRMOpenShiftManagedClustersKubeconfigInfo, self).__init__(self.module_arg_spec, supports_check_mode=True, supports_tags=False)
+        super(AzureRMOpenShiftManagedClustersKubeconfigInfo, self).__init__(self.module_arg_spec,
+                                                                            supports_check_mode=True,
+                                                                            supports_tags=False,
+                                                                            required_one_of=[['name', 'clusters']],
+                                                                            required_together=[['resource_group', 'name']],
+                                                                            mutually_exclusive=[['name', 'clusters']])
 
     def exec_module(self, **kwargs):
 
         for key in self.module_arg_spec:
             setattr(self, key, kwargs[key])
 
-        self.mgmt_client = self.get_mgmt_svc_client(GenericRestClient,
-                                                    base_url=self._cloud_environment.endpoints.resource_manager)
-        self.results = self.get_kubeconfig()
-        if self.path and self.path_is_valid():
-            self.write_kubeconfig_to_file()
+        # Admin credentials are stored in plain text, in files only readable by their owner
+        self.credentials_cache = cache_from_params(self.cache, 'kubeconfigs', enabled=True)
+
+        if self.clusters:
+            self.results = dict(changed=False, clusters=self.fetch_all())
+            self.results['changed'] = any(c.get('changed') for c in self.results['clusters'].values())
+            return self.results
+
+        try:
+            self.results = self.fetch(self.resource_group, self.name)
+        except Exception as exc:
+            self.fail("Could not get the admin credentials of the cluster {0}: {1}".format(self.name, str(exc)))
+        if not self.results['kubeconfig']:
+            self.fail("Could not get the admin credentials of the cluster {0}".format(self.name))
+        if self.path:
+            try:
+                self.path = self.path_is_valid(self.path)
+                self.results['changed'] = self.write_kubeconfig_to_file(self.path, self.results['kubeconfig'])
+            except Exception as exc:
+                self.fail("Failed to write kubeconfig output to file - {0} - {1}".format(self.path, exc))
         return self.results
 
-    def get_kubeconfig(self):
-        response = None
-        results = {}
-        # prepare url
-        self.url = ('/subscriptions' +
-                    '/{{ subscription_id }}' +
-                    '/resourceGroups' +
-                    '/{{ resource_group }}' +
-                    '/providers' +
-                    '/Microsoft.RedHatOpenShift' +
-                    '/openShiftClusters' +
-                    '/{{ cluster_name }}' +
-                    '/listAdminCredentials')
-        self.url = self.url.replace('{{ subscription_id }}', self.subscription_id)
-        self.url = self.url.replace('{{ resource_group }}', self.resource_group)
-        self.url = self.url.replace('{{ cluster_name }}', self.name)
-        self.log("Fetch for kubeconfig from the cluster.")
+    def fetch_all(self):
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(self.clusters)))) as executor:
+            statuses = executor.map(self.fetch_and_write, self.clusters)
+            return dict(('{0}/{1}'.format(c['resource_group'], c['name']), status)
+                        for c, status in zip(self.clusters, statuses))
+
+    def fetch_and_write(self, cluster):
+        status = dict(changed=False)
+        path = cluster.get('path') or self.path
         try:
-            response = self.mgmt_client.query(self.url,
-                                              'POST',
-                                              self.query_parameters,
-                                              self.header_parameters,
-                                              None,
-                                              self.status_code,
-                                              600,
-                                              30)
-            results = json.loads(response.body())
-        except Exception as e:
-            self.log('Could not get info for @(Model.ModuleOperationNameUpper).')
-        return self.format_item(results)
+            result = self.fetch(cluster['resource_group'], cluster['name'])
+            status['cached'] = result['cached']
+            if not result['kubeconfig']:
+                status['failed'] = True
+                status['msg'] = 'Could not get the admin credentials'
+                return status
+            if path:
+                path = self.path_is_valid(path.format(resource_group=cluster['resource_group'], name=cluster['name']))
+                status['path'] = path
+                status['changed'] = self.write_kubeconfig_to_file(path, result['kubeconfig'])
+            else:
+                status['kubeconfig'] = result['kubeconfig']
+        except Exception as exc:
+            status['failed'] = True
+            status['msg'] = str(exc)
+        return status
+
+    def fetch(self, resource_group, name):
+        cache_key = None
+        if self.credentials_cache is not None:
+            cache_key = self.credentials_cache.key(self.subscription_id, resource_group, name,
+                                                   self.query_parameters['api-version'])
+            cached = None if self.refresh else self.credentials_cache.get(cache_key)
+            if cached and cached['expires'] - time.time() > self.renew_before:
+                self.log("Using cached kubeconfig, its certificate expires at {0}.".format(cached['expires']))
+                return dict(kubeconfig=cached['kubeconfig'], expires=cached['expires'], cached=True)
+
+        with self.client_lock:
+            if self.mgmt_client is None:
+                self.mgmt_client = get_rest_client(self)
+        results = self.get_kubeconfig(resource_group, name)
+        results['cached'] = False
+        if self.credentials_cache is not None and results['kubeconfig']:
+            expires = client_certificate_expiry(results['kubeconfig'])
+            if expires is not None:
+                results['expires'] = expires
+                self.credentials_cache.put(cache_key, dict(kubeconfig=results['kubeconfig'], expires=expires))
+        return results
+
+    def get_kubeconfig(self, resource_group, name):
+        # prepare url
+        url = ('/subscriptions' +
+               '/{{ subscription_id }}' +
+               '/resourceGroups' +
+               '/{{ resource_group }}' +
+               '/providers' +
+               '/Microsoft.RedHatOpenShift' +
+               '/openShiftClusters' +
+               '/{{ cluster_name }}' +
+               '/listAdminCredentials')
+        url = url.replace('{{ subscription_id }}', self.subscription_id)
+        url = url.replace('{{ resource_group }}', resource_group)
+        url = url.replace('{{ cluster_name }}', name)
+        self.log("Fetch for kubeconfig from the cluster {0}.".format(name))
+        # The client adds per-request headers to the dict it is given, which the workers must not share
+        response = self.mgmt_client.query(url,
+                                          'POST',
+                                          self.query_parameters,
+                                          dict(self.header_parameters),
+                                          None,
+                                          self.status_code,
+                                          600,
+                                          30)
+        return self.format_item(json.loads(response.body()))
 
     def format_item(self, item):
         d = {
@@ -163,60 +339,76 @@ class AzureRMOpenShiftManagedClustersKubeconfigInfo(AzureRMModuleBaseExt):
         }
         return d
 
-    def path_is_valid(self):
-        if not os.path.basename(self.path):
-            if os.path.isdir(self.path):
-                self.log("Path is dir. Appending file name.")
-                self.path += "kubeconfig"
-            else:
-                try:
-                    self.log('Attempting to makedirs {0}'.format(self.path))
-                    os.makedirs(self.path)
-                except IOError as exc:
-                    self.fail("Failed to create directory {0} - {1}".format(self.path, str(exc)))
-                self.path += "kubeconfig"
+    def path_is_valid(self, path):
+        """Create the directories leading to path and return the kubeconfig file path."""
+        # several workers may create the same directory at once
+        if not os.path.basename(path):
+            self.log('Attempting to makedirs {0}'.format(path))
+            os.makedirs(path, exist_ok=True)
+            self.log("Path is dir. Appending file name.")
+            path += "kubeconfig"
         else:
-            file_name = os.path.basename(self.path)
-            path = self.path.replace(file_name, '')
-            self.log('Checking path {0}'. format(path))
+            directory = os.path.dirname(path)
+            self.log('Checking path {0}'. format(directory))
             # If the "path" is not defined, it's cwd.
-            if path and not os.path.isdir(path):
-                try:
-                    self.log('Attempting to makedirs {0}'. format(path))
-                    os.makedirs(path)
-                except IOError as exc:
-                    self.fail("Failed to create directory {0} - {1}".format(path, str(exc)))
-        self.log("Validated path - {0}". format(self.path))
-        return True
-
-    def write_kubeconfig_to_file(self):
-        decoded_bytes = base64.b64decode(self.results['kubeconfig'])
-        decoded_string = decoded_bytes.decode("utf-8")
-
-        if os.path.exists(self.path):
-            self.log('Existing kubeconfig file found. Compare, to decide if needs to override')
-            # If kubeconfig file already exists, compare it with the new file
-            # If equal, do nothing, otherwise, override.
-            tmp_kubeconfig = tempfile.TemporaryFile(mode='w')
-            tmp_kubeconfig.write(decoded_string)
-            tmp_kubeconfig.seek(0)
+            if directory:
+                self.log('Attempting to makedirs {0}'. format(directory))
+                os.makedirs(directory, exist_ok=True)
+        self.log("Validated path - {0}". format(path))
+        return path
 
-            # No need to close the temp file as it's closed by filecmp.cmp.
-            if filecmp.cmp(tmp_kubeconfig.name, self.path):
-                self.log("Files are identical. No need to override.")
-                self.results['changed'] = False
-                return
+    def digest_path(self, path):
+        return os.path.join(os.path.dirname(path), '.{0}.digest'.format(os.path.basename(path)))
 
-        self.log("Create {0} kubeconfig file.".format(self.path))
+    def read_digest(self, path):
         try:
-            with open(self.path, "w") as file:
-                file.write(decoded_string)
-        except Exception as exc:
-            self.fail("Failed to write kubeconfig output to file - {0} to {1} - {2}".format(self.results['kubeconfig'],
-                                                                                            self.path, exc))
-        self.log("The {0} kubeconfig file has been created.")
-        self.results['changed'] = True
-        return
+            with open(self.digest_path(path)) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def write_atomic(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def write_kubeconfig_to_file(self, path, encoded):
+        """Write the base64 encoded kubeconfig to path, returning whether the file changed."""
+        source_digest = hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+        stored = self.read_digest(path)
+
+        if os.path.exists(path) and stored.get('source') == source_digest:
+            stat = os.stat(path)
+            if stored.get('size') == stat.st_size and stored.get('mtime') == stat.st_mtime:
+                self.log("Kubeconfig unchanged since it was written. No need to override.")
+                return False
+
+        decoded_bytes = base64.b64decode(encoded)
+        digest = hashlib.sha256(decoded_bytes).hexdigest()
+        changed = True
+        if os.path.exists(path):
+            self.log('Existing kubeconfig file found. Compare, to decide if needs to override')
+            # If kubeconfig file already exists, compare digests
+            # If equal, do nothing, otherwise, override.
+            with open(path, 'rb') as f:
+                changed = hashlib.sha256(f.read()).hexdigest() != digest
+
+        if changed:
+            self.log("Create {0} kubeconfig file.".format(path))
+            self.write_atomic(path, decoded_bytes)
+            self.log("The {0} kubeconfig file has been created.".format(path))
+        stat = os.stat(path)
+        self.write_atomic(self.digest_path(path), json.dumps(dict(source=source_digest,
+                                                                  sha256=digest,
+                                                                  size=stat.st_size,
+                                                                  mtime=stat.st_mtime)).encode('utf-8'))
+        return changed
 
 
 def main():
@@ -0,0 +1,194 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2024 Red Hat, Inc.
+#
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+
+DOCUMENTATION = '''
+---
+module: azure_rm_openshiftmanagedclusterroleset_info
+version_added: '1.1.0'
+short_description: Fetch the platform workload identity role sets of Azure Red Hat OpenShift
+description:
+    - Fetch the platform workload identities, and their roles, needed by the clusters of each OpenShift version in a region.
+    - Role sets are cached locally, so the clusters of a region share one request.
+options:
+    location:
+        description:
+            - Region to list the role sets of.
+        required: true
+        type: str
+    version:
+        description:
+            - OpenShift version, e.g. C(4.15) or C(4.15.35), to select the role set of in I(platform_workload_identity_roles).
+            - Defaults to the first role set returned.
+        type: str
+    api_version:
+        description:
+            - Resource provider API version.
+        type: str
+        default: '2024-08-12-preview'
+    rp_mode:
+        description:
+            - Use production or development RP.
+        type: str
+        choices:
+            - production
+            - development
+        default: production
+    refresh:
+        description:
+            - Ignore cached role sets and fetch them from the resource provider.
+        type: bool
+        default: false
+extends_documentation_fragment:
+    - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_cache
+author:
+    - Red Hat
+'''
+
+EXAMPLES = '''
+- name: Get the platform workload identity roles of OpenShift 4.15 clusters
+  azure_rm_openshiftmanagedclusterroleset_info:
+    location: eastus
+    version: "4.15"
+  register: rolesets
+
+- name: Show them
+  debug:
+    msg: "{{ rolesets.platform_workload_identity_roles | map(attribute='operatorName') }}"
+'''
+
+RETURN = '''
+rolesets:
+    description:
+        - The role sets of the region, as returned by the resource provider.
+    returned: always
+    type: list
+    elements: dict
+platform_workload_identity_roles:
+    description:
+        - Roles of the role set of I(version).
+    returned: always
+    type: list
+    elements: dict
+    sample: [{"operatorName": "ingress", "roleDefinitionName": "Azure Red Hat OpenShift Cluster Ingress Operator",
+              "roleDefinitionId": "/providers/Microsoft.Authorization/roleDefinitions/0336e1d3-7a87-462b-b6db-342b63f7802c",
+              "serviceAccounts": ["system:serviceaccount:openshift-ingress-operator:ingress-operator"]}]
+cached:
+    description:
+        - Whether the role sets were read from the local cache.
+    returned: always
+    type: bool
+'''
+
+from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import cache_arg_spec, cache_from_params
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_paging import iter_items
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+
+
+class AzureRMOpenShiftManagedClustersRoleSetInfo(AzureRMModuleBaseExt):
+    def __init__(self):
+        self.module_arg_spec = dict(
+            location=dict(
+                type='str', required=True
+            ),
+            version=dict(
+                type='str'
+            ),
+            api_version=dict(
+                type='str', default='2024-08-12-preview'
+            ),
+            rp_mode=dict(
+                type='str', choices=['production', 'development'], default='production'
+            ),
+            refresh=dict(
+                type='bool', default=False
+            ),
+            cache=cache_arg_spec()
+        )
+
+        self.location = None
+        self.version = None
+        self.api_version = None
+        self.rp_mode = 'production'
+        self.refresh = False
+        self.cache = None
+        self.rolesets_cache = None
+
+        self.results = dict(changed=False)
+        self.mgmt_client = None
+        self.status_code = [200]
+
+        self.query_parameters = {}
+        self.header_parameters = {}
+        self.header_parameters['Content-Type'] = 'application/json; charset=utf-8'
+
+        super(AzureRMOpenShiftManagedClustersRoleSetInfo, self).__init__(self.module_arg_spec, supports_check_mode=True, supports_tags=False)
+
+    def exec_module(self, **kwargs):
+
+        for key in self.module_arg_spec:
+            setattr(self, key, kwargs[key])
+
+        self.query_parameters['api-version'] = self.api_version
+        # Role sets only change with new OpenShift minor versions
+        self.rolesets_cache = cache_from_params(self.cache, 'rolesets', enabled=True, ttl=21600)
+
+        cache_key = rolesets = None
+        if self.rolesets_cache is not None:
+            cache_key = self.rolesets_cache.key(self.subscription_id, self.location.lower(), self.api_version, self.rp_mode)
+            if not self.refresh:
+                rolesets = self.rolesets_cache.get(cache_key)
+
+        self.results['cached'] = rolesets is not None
+        if rolesets is None:
+            self.mgmt_client = get_rest_client(self, self.rp_mode)
+            rolesets = self.get_rolesets()
+            if self.rolesets_cache is not None and rolesets:
+                self.rolesets_cache.put(cache_key, rolesets)
+        else:
+            self.log("Using cached role sets in {0}.".format(self.location))
+
+        self.results['rolesets'] = rolesets
+        self.results['platform_workload_identity_roles'] = self.select_roles(rolesets)
+        return self.results
+
+    def get_rolesets(self):
+        url = ('/subscriptions/{0}/providers/Microsoft.RedHatOpenShift/locations/{1}/platformworkloadidentityrolesets'
+               .format(self.subscription_id, self.location))
+        self.log("Fetch platform workload identity role sets in {0}.".format(self.location))
+        try:
+            return list(iter_items(self.mgmt_client,
+                                   url,
+                                   self.query_parameters,
+                                   self.header_parameters,
+                                   self.status_code))
+        except Exception as e:
+            self.fail('Could not get the platform workload identity role sets in {0}: {1}'.format(self.location, str(e)))
+
+    def select_roles(self, rolesets):
+        if not rolesets:
+            return []
+        if not self.version:
+            return rolesets[0].get('properties', {}).get('platformWorkloadIdentityRoles', [])
+        minor = '.'.join(self.version.split('.')[:2])
+        for roleset in rolesets:
+            properties = roleset.get('properties', {})
+            if properties.get('openShiftVersion') == minor:
+                return properties.get('platformWorkloadIdentityRoles', [])
+        self.fail('No platform workload identity role set for OpenShift {0} in {1}'.format(self.version, self.location))
+
+
+def main():
+    AzureRMOpenShiftManagedClustersRoleSetInfo()
+
+
+if __name__ == '__main__':
+    main()
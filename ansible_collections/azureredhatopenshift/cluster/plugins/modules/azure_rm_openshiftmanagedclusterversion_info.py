@@ -19,10 +19,35 @@ options:
     location:
         description:
             - List install versions available for the defined region.
+            - Several regions may be given, or C(all) for every region the resource provider is available in.
+              They are queried concurrently.
         required: true
+        type: list
+        elements: str
+    max_workers:
+        description:
+            - Maximum number of concurrent requests when several regions are given.
+        type: int
+        default: 8
+    latest:
+        description:
+            - Resolve the newest version starting with this prefix, e.g. C(4.16) for the newest 4.16 z-stream.
+            - Use an empty string for the newest version overall.
+        type: str
+    constraint:
+        description:
+            - Resolve the newest version satisfying this constraint, e.g. C(>=4.15,<4.17).
+            - Clauses are comma separated and use C(>=), C(>), C(<=), C(<), C(==) or C(!=).
+              A clause without operator is a version prefix.
         type: str
+    refresh:
+        description:
+            - Ignore a cached list of versions and fetch it from the resource provider.
+        type: bool
+        default: false
 extends_documentation_fragment:
     - azure.azcollection.azure
+    - azureredhatopenshift.cluster.aro_cache
 author:
     - Maxim Babushkin (@maxbab)
 '''
@@ -31,19 +56,85 @@ EXAMPLES = '''
 - name: Obtain openshift versions for ARO cluster
   azure_rm_openshiftmanagedclusterversion_info:
     location: centralus
+
+- name: Obtain openshift versions, bypassing the local cache
+  azure_rm_openshiftmanagedclusterversion_info:
+    location: centralus
+    refresh: true
+
+- name: Find the newest version installable in several regions
+  azure_rm_openshiftmanagedclusterversion_info:
+    location:
+      - eastus
+      - westeurope
+      - australiaeast
+  register: region_matrix
+
+- name: Show it
+  debug:
+    msg: "{{ region_matrix.latest_common }}"
+
+- name: Resolve the newest 4.16 z-stream
+  azure_rm_openshiftmanagedclusterversion_info:
+    location: eastus
+    latest: "4.16"
+  register: newest_416
+
+- name: Resolve a version within a range
+  azure_rm_openshiftmanagedclusterversion_info:
+    location: eastus
+    constraint: ">=4.15,<4.17"
+  register: in_range
 '''
 
 RETURN = '''
 versions:
     description:
         - openshift versions values
+        - With several regions, the versions available in all of them.
     returned: always
     type: list
+locations:
+    description:
+        - Versions available per region.
+    returned: always
+    type: dict
+    sample: {"eastus": ["4.15.35", "4.16.30"], "westeurope": ["4.16.30"]}
+union:
+    description:
+        - Versions available in at least one region, oldest first.
+    returned: always
+    type: list
+intersection:
+    description:
+        - Versions available in every region, oldest first.
+    returned: always
+    type: list
+latest_common:
+    description:
+        - Newest version available in every region.
+    returned: always
+    type: str
+    sample: 4.16.30
+resolved:
+    description:
+        - Newest of I(versions) matching I(latest) or I(constraint), null if none does.
+    returned: when I(latest) or I(constraint) is set
+    type: str
+    sample: 4.16.30
+cached:
+    description:
+        - Whether the versions were read from the local cache.
+    returned: always
+    type: bool
 '''
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_ext import AzureRMModuleBaseExt
-from ansible_collections.azure.azcollection.plugins.module_utils.azure_rm_common_rest import GenericRestClient
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_cache import cache_arg_spec, cache_from_params
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_rest import get_rest_client
+from ansible_collections.azureredhatopenshift.cluster.plugins.module_utils.aro_versions import VersionIndex, latest, version_key
 
 
 class Actions:
@@ -54,11 +145,30 @@ class AzureRMOpenShiftManagedClustersVersionInfo(AzureRMModuleBaseExt):
     def __init__(self):
         self.module_arg_spec = dict(
             location=dict(
-                type='str', required=True
-            )
+                type='list', elements='str', required=True
+            ),
+            max_workers=dict(
+                type='int', default=8
+            ),
+            latest=dict(
+                type='str'
+            ),
+            constraint=dict(
+                type='str'
+            ),
+            refresh=dict(
+                type='bool', default=False
+            ),
+            cache=cache_arg_spec()
         )
 
         self.location = None
+        self.max_workers = 8
+        self.latest = None
+        self.constraint = None
+        self.refresh = False
+        self.versions_cache = None
+        self.cache = None
 
         self.results = dict(changed=False)
         self.mgmt_client = None
@@ -79,43 +189,123 @@ class AzureRMOpenShiftManagedClustersVersionInfo(AzureRMModuleBaseExt):
         for key in self.module_arg_spec:
             setattr(self, key, kwargs[key])
 
-        self.mgmt_client = self.get_mgmt_svc_client(GenericRestClient,
-                                                    base_url=self._cloud_environment.endpoints.resource_manager)
-        self.results = self.get_versions()
+        # The list of versions changes a few times a week at most
+        self.versions_cache = cache_from_params(self.cache, 'versions', enabled=True, ttl=21600)
+
+        locations = self.location
+        if [x.lower() for x in locations] == ['all']:
+            locations = self.get_locations()
+
+        by_location = {}
+        missing = []
+        for location in locations:
+            versions = self.get_cached_versions(location)
+            if versions is None:
+                missing.append(location)
+            else:
+                by_location[location] = versions
+
+        if missing:
+            self.mgmt_client = get_rest_client(self)
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(missing)))) as executor:
+                fetched = dict(zip(missing, executor.map(self.try_get_versions, missing)))
+            # an empty list for a failing region would silently empty the intersection
+            errors = sorted('{0}: {1}'.format(location, error) for location, (versions, error) in fetched.items() if error is not None)
+            if errors:
+                self.fail('Could not get the versions of openshift cluster in {0}'.format('; '.join(errors)))
+            by_location.update((location, versions) for location, (versions, error) in fetched.items())
+
+        sets = [set(v) for v in by_location.values()]
+        intersection = set.intersection(*sets) if sets else set()
+        self.results = dict(
+            changed=False,
+            versions=[v for v in by_location[locations[0]] if v in intersection] if locations else [],
+            locations=by_location,
+            union=sorted(set.union(set(), *sets), key=version_key),
+            intersection=sorted(intersection, key=version_key),
+            latest_common=latest(intersection),
+            cached=not missing,
+        )
+        if self.latest is not None or self.constraint:
+            index = VersionIndex(self.results['versions'])
+            try:
+                if self.constraint:
+                    self.results['resolved'] = index.resolve(self.constraint)
+                else:
+                    self.results['resolved'] = index.latest(self.latest)
+            except ValueError as exc:
+                self.fail(str(exc))
         return self.results
 
-    def get_versions(self):
-        response = None
-        resp_results = {}
-        results = {}
-        # prepare url
-        self.url = ('/subscriptions' +
-                    '/{{ subscription_id }}' +
-                    '/providers' +
-                    '/Microsoft.RedHatOpenShift' +
-                    '/locations' +
-                    '/{{ location }}' +
-                    '/openshiftversions')
-        self.url = self.url.replace('{{ subscription_id }}', self.subscription_id)
-        self.url = self.url.replace('{{ location }}', self.location)
-        self.log("Fetch versions of openshift cluster.")
+    def get_cached_versions(self, location):
+        if self.versions_cache is None or self.refresh:
+            return None
+        versions = self.versions_cache.get(self.cache_key(location))
+        if versions is not None:
+            self.log("Using cached versions of openshift cluster in {0}.".format(location))
+        return versions
+
+    def cache_key(self, location):
+        return self.versions_cache.key(self.subscription_id, location, self.query_parameters['api-version'])
+
+    def get_locations(self):
+        if self.mgmt_client is None:
+            self.mgmt_client = get_rest_client(self)
+        url = '/subscriptions/{0}/providers/Microsoft.RedHatOpenShift'.format(self.subscription_id)
         try:
-            response = self.mgmt_client.query(self.url,
+            response = self.mgmt_client.query(url,
                                               'GET',
-                                              self.query_parameters,
+                                              {'api-version': '2021-04-01'},
                                               self.header_parameters,
                                               None,
                                               self.status_code,
                                               600,
                                               30)
-            if isinstance(response.text, str):
-                resp_results = json.loads(response.text)
-            else:
-                resp_results = json.loads(response.text())
+            provider = json.loads(response.body())
         except Exception as e:
-            self.log('Could not get info for @(Model.ModuleOperationNameUpper).')
-        results['versions'] = self.format_versions(resp_results)
-        return results
+            self.fail('Could not get the regions of the Microsoft.RedHatOpenShift provider: {0}'.format(str(e)))
+        locations = []
+        for resource_type in provider.get('resourceTypes', []):
+            if resource_type.get('resourceType', '').lower() == 'openshiftclusters':
+                locations = [x.replace(' ', '').lower() for x in resource_type.get('locations', [])]
+        return sorted(set(locations))
+
+    def try_get_versions(self, location):
+        """Run on a worker thread, so errors are returned, not raised."""
+        try:
+            return self.get_versions(location), None
+        except Exception as exc:
+            return None, str(exc)
+
+    def get_versions(self, location):
+        # prepare url
+        url = ('/subscriptions' +
+               '/{{ subscription_id }}' +
+               '/providers' +
+               '/Microsoft.RedHatOpenShift' +
+               '/locations' +
+               '/{{ location }}' +
+               '/openshiftversions')
+        url = url.replace('{{ subscription_id }}', self.subscription_id)
+        url = url.replace('{{ location }}', location)
+        self.log("Fetch versions of openshift cluster in {0}.".format(location))
+        # The client adds per-request headers to the dict it is given, which the workers must not share
+        response = self.mgmt_client.query(url,
+                                          'GET',
+                                          self.query_parameters,
+                                          dict(self.header_parameters),
+                                          None,
+                                          self.status_code,
+                                          600,
+                                          30)
+        if isinstance(response.text, str):
+            resp_results = json.loads(response.text)
+        else:
+            resp_results = json.loads(response.text())
+        versions = self.format_versions(resp_results)
+        if self.versions_cache is not None and versions:
+            self.versions_cache.put(self.cache_key(location), versions)
+        return versions
 
     def format_versions(self, version):
         result = list()